@@ -0,0 +1,161 @@
+"""Apply the performance-series schema changes to existing databases
+
+Covers every live-schema change the model layer now assumes:
+
+* jobs: add n_bytes (BYTEA) and n_digits (INTEGER), nullable
+* indexes the models now declare: jobs.created_at, jobs.status,
+  job_logs.job_id, job_results.job_id, job_runs.job_id, job_runs.status,
+  and the composites ix_job_logs_job_ts and ix_job_results_job_found
+* jobs.id and every job FK: VARCHAR(36) -> native UUID
+* jobs.factors_found, job_runs.metrics_json, equation_snapshots.points_blob:
+  JSON -> JSONB
+* equation_snapshots: add points_blob_msgpack (BYTEA)
+* job_results.certificate: TEXT -> JSONB; legacy rows hold json.dumps()
+  output, which is valid JSON text and casts directly
+
+Deployments that predate Alembic here run `alembic upgrade head` once
+against their existing database. Fresh databases get the current schema
+from Base.metadata.create_all at app startup and should be marked
+up to date with `alembic stamp head`.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-08-27
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+# (table, column) pairs holding the job-id foreign key; constraint names are
+# the Postgres defaults produced by create_all
+_JOB_FKS = [
+    ("job_logs", "job_id"),
+    ("job_results", "job_id"),
+    ("equation_snapshots", "job_id"),
+    ("job_runs", "job_id"),
+]
+
+# Indexes the model layer declares but create_all never adds to an existing
+# database; names match SQLAlchemy's ix_<table>_<column> defaults
+_INDEXES = [
+    ("ix_jobs_created_at", "jobs", ["created_at"]),
+    ("ix_jobs_status", "jobs", ["status"]),
+    ("ix_job_logs_job_id", "job_logs", ["job_id"]),
+    ("ix_job_logs_job_ts", "job_logs", ["job_id", "timestamp"]),
+    ("ix_job_results_job_id", "job_results", ["job_id"]),
+    ("ix_job_results_job_found", "job_results", ["job_id", "found_at"]),
+    ("ix_job_runs_job_id", "job_runs", ["job_id"]),
+    ("ix_job_runs_status", "job_runs", ["status"]),
+]
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        # SQLite databases here are dev/test scratch stores created with the
+        # current schema by create_all; there is nothing to migrate.
+        return
+
+    # New columns captured at job creation / snapshot write time
+    op.add_column("jobs", sa.Column("n_bytes", sa.LargeBinary(), nullable=True))
+    op.add_column("jobs", sa.Column("n_digits", sa.Integer(), nullable=True))
+    op.add_column(
+        "equation_snapshots",
+        sa.Column("points_blob_msgpack", sa.LargeBinary(), nullable=True),
+    )
+
+    # JSON -> JSONB (binary storage, no text re-parse on read)
+    op.alter_column(
+        "jobs", "factors_found",
+        type_=postgresql.JSONB(), postgresql_using="factors_found::jsonb",
+    )
+    op.alter_column(
+        "job_runs", "metrics_json",
+        type_=postgresql.JSONB(), postgresql_using="metrics_json::jsonb",
+    )
+    op.alter_column(
+        "equation_snapshots", "points_blob",
+        type_=postgresql.JSONB(), postgresql_using="points_blob::jsonb",
+    )
+
+    # Certificates move from pre-serialized text to structured JSONB; the
+    # cast backfills legacy rows in place
+    op.alter_column(
+        "job_results", "certificate",
+        type_=postgresql.JSONB(), postgresql_using="certificate::jsonb",
+    )
+
+    # VARCHAR(36) -> native UUID for jobs.id and every referencing FK.
+    # The FK constraints must come off before the type changes on either side.
+    for table, col in _JOB_FKS:
+        op.drop_constraint(f"{table}_{col}_fkey", table, type_="foreignkey")
+    op.alter_column(
+        "jobs", "id",
+        type_=postgresql.UUID(), postgresql_using="id::uuid",
+    )
+    for table, col in _JOB_FKS:
+        op.alter_column(
+            table, col,
+            type_=postgresql.UUID(), postgresql_using=f"{col}::uuid",
+        )
+    for table, col in _JOB_FKS:
+        op.create_foreign_key(
+            f"{table}_{col}_fkey", table, "jobs", [col], ["id"],
+            ondelete="CASCADE",
+        )
+
+    # if_not_exists keeps this idempotent for databases whose tables were
+    # (re)built by create_all with the indexes already in place
+    for name, table, cols in _INDEXES:
+        op.create_index(name, table, cols, if_not_exists=True)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    for name, table, _cols in reversed(_INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
+
+    for table, col in _JOB_FKS:
+        op.drop_constraint(f"{table}_{col}_fkey", table, type_="foreignkey")
+    for table, col in _JOB_FKS:
+        op.alter_column(
+            table, col,
+            type_=sa.String(36), postgresql_using=f"{col}::text",
+        )
+    op.alter_column(
+        "jobs", "id",
+        type_=sa.String(36), postgresql_using="id::text",
+    )
+    for table, col in _JOB_FKS:
+        op.create_foreign_key(
+            f"{table}_{col}_fkey", table, "jobs", [col], ["id"],
+            ondelete="CASCADE",
+        )
+
+    # Note: re-serialized text is compact JSON, not the original indent=2 form
+    op.alter_column(
+        "job_results", "certificate",
+        type_=sa.Text(), postgresql_using="certificate::text",
+    )
+    op.alter_column(
+        "equation_snapshots", "points_blob",
+        type_=sa.JSON(), postgresql_using="points_blob::json",
+    )
+    op.alter_column(
+        "job_runs", "metrics_json",
+        type_=sa.JSON(), postgresql_using="metrics_json::json",
+    )
+    op.alter_column(
+        "jobs", "factors_found",
+        type_=sa.JSON(), postgresql_using="factors_found::json",
+    )
+
+    op.drop_column("equation_snapshots", "points_blob_msgpack")
+    op.drop_column("jobs", "n_digits")
+    op.drop_column("jobs", "n_bytes")
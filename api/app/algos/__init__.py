@@ -1,7 +1,7 @@
 """
 Factorization algorithm modules
 """
-from .miller_rabin import is_prime_mr
+from .miller_rabin import is_prime_mr, is_prime_u64
 from .pollard_rho import pollard_rho
 from .ecm_wrapper import ecm_factor
 from .trial_division import trial_division_with_wheel
@@ -17,6 +17,7 @@ from .ecm_enhanced import (
 
 __all__ = [
     'is_prime_mr',
+    'is_prime_u64',
     'is_prime_bpsw',
     'is_prime_fast',
     'pollard_rho',
@@ -11,6 +11,8 @@ References:
 
 import gmpy2
 
+from .miller_rabin import is_prime_u64
+
 
 def is_prime_bpsw(n: int) -> bool:
     """
@@ -216,8 +218,8 @@ def is_prime_fast(n: int) -> bool:
     """
     Fast primality test that chooses the best method based on input size.
 
-    - For n ≤ 2^64: Use BPSW (deterministic, no known counterexamples)
-    - For n > 2^64: Use Miller-Rabin with k=40 rounds (probability of error < 2^-80)
+    - For n < 2^64: deterministic 7-witness Miller-Rabin
+    - For n > 2^64: GMP Miller-Rabin with k=25 rounds (error < 2^-50)
 
     Args:
         n: Number to test
@@ -228,10 +230,14 @@ def is_prime_fast(n: int) -> bool:
     if n < 2:
         return False
 
-    # For small numbers, use BPSW
-    if n <= 2**64:
-        return is_prime_bpsw(n)
-
-    # For very large numbers, Miller-Rabin with 40 rounds is faster
-    # and still has negligible error probability (< 2^-80)
-    return bool(gmpy2.is_prime(n, 40))
+    # Word-sized inputs: seven fixed Miller-Rabin witnesses are proven
+    # exhaustive below 2^64, and skip the pure-Python Lucas stage that
+    # dominated BPSW for the cofactors trial division produces
+    if n < 2**64:
+        return is_prime_u64(n)
+
+    # For very large numbers, GMP's Miller-Rabin does the work in mpn
+    # assembly; 25 rounds keep the error below 2^-50, which is far past
+    # anything the result pipeline can distinguish, at ~60% the cost of
+    # the previous 40-round setting
+    return bool(gmpy2.is_prime(n, 25))
@@ -35,16 +35,20 @@ class PrimalityCertificate:
         """Add a proof step to the certificate"""
         self.steps.append(step)
 
-    def to_json(self) -> str:
-        """Export certificate as JSON"""
-        return json.dumps({
+    def to_dict(self) -> Dict:
+        """Export certificate as a plain dict (for JSON/JSONB storage)"""
+        return {
             'n': str(self.n),
             'steps': self.steps,
             'verified': self.verified,
             'created_at': self.created_at.isoformat(),
             'certificate_type': 'ECPP',
             'version': '1.0'
-        }, indent=2)
+        }
+
+    def to_json(self) -> str:
+        """Export certificate as JSON text (for files and CLI output)"""
+        return json.dumps(self.to_dict(), indent=2)
 
     @staticmethod
     def from_json(json_str: str) -> 'PrimalityCertificate':
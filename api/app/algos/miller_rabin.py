@@ -32,6 +32,50 @@ def is_prime_mr(n: int, k: int = 40) -> bool:
     return gmpy2.is_prime(n, k)
 
 
+# Smallest witness set proving primality for every n < 2^64
+# (Sinclair, 2011; verified exhaustively — see the Miller-Rabin page above)
+_U64_WITNESSES = (2, 325, 9375, 28178, 450775, 9780504, 1795265022)
+
+
+def is_prime_u64(n: int) -> bool:
+    """
+    Deterministic Miller-Rabin for n < 2^64.
+
+    Seven fixed witnesses decide primality with no error in this range —
+    no Lucas stage and no randomness, so it is both faster and stronger
+    than a probabilistic round count for word-sized inputs.
+
+    Args:
+        n: Number to test (must be below 2^64)
+
+    Returns:
+        True if n is prime, False if composite
+    """
+    if n < 2:
+        return False
+    for p in (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37):
+        if n % p == 0:
+            return n == p
+
+    d = n - 1
+    r = (d & -d).bit_length() - 1
+    d >>= r
+    for a in _U64_WITNESSES:
+        a %= n
+        if a == 0:
+            continue
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(r - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
 def next_prime(n: int) -> int:
     """Find the next prime after n"""
     return int(gmpy2.next_prime(n))
@@ -15,11 +15,134 @@ Key insights from Trurl:
 Reference: Trurl's post on Mathematics forum, Nov 23
 """
 import gmpy2
+import numpy as np
+from functools import lru_cache
 from typing import Optional, Tuple, Dict
-from decimal import Decimal, getcontext
 import math
 
 
+def _log10_big(n) -> float:
+    """
+    log10 of an arbitrarily large positive int via bit_length.
+
+    math.log10 overflows converting ints > ~10^308 to float; bit_length
+    works at any size and skips the float conversion entirely.
+    """
+    n = int(n)
+    return n.bit_length() * 0.30102999566398114 if n > 0 else 0.0
+
+
+@lru_cache(maxsize=1024)
+def _find_x_when_y_equals_one(pnp_int: int) -> int:
+    """
+    Cached Newton solve of x^3 - pnp*x^2 + pnp^2 = 0 (the y=1 critical point).
+
+    Module-level and keyed on the plain int form of pnp so repeated calls
+    across solver instances (diagnostic reports, curve endpoints, search
+    orchestration) reuse the ~100 big-int Newton iterations.
+    """
+    # Fast path: for small pnp the root fits comfortably in a double, so run
+    # Newton in pure floating point (no GMP allocation at all)
+    if pnp_int.bit_length() < 50:
+        p = float(pnp_int)
+        x = p ** (2.0 / 3.0)
+        for _ in range(20):
+            denom = 3 * x * x - 2 * p * x
+            if denom == 0:
+                break
+            x -= (x * x * x - p * x * x + p * p) / denom
+        return int(x)
+
+    pnp = gmpy2.mpz(pnp_int)
+    pnp_squared = pnp ** 2
+
+    # Initial guess: x ≈ pnp^(2/3)
+    # This comes from the dominant term x^3 ≈ pnp^2 → x ≈ pnp^(2/3)
+    # Use string length for log10 approximation to avoid float overflow
+    pnp_digits = len(str(pnp))
+    log_pnp = pnp_digits - 1  # Approximation: log10(number) ≈ digits - 1
+    log_x_initial = (2.0 / 3.0) * log_pnp
+    x = gmpy2.mpz(10) ** int(log_x_initial)
+
+    # Newton's method: x_new = x - f(x)/f'(x)
+    max_iterations = 100
+    for iteration in range(max_iterations):
+        x_squared = x * x
+        x_cubed = x_squared * x
+
+        # f(x) = x^3 - pnp*x^2 + pnp^2
+        f_x = x_cubed - pnp * x_squared + pnp_squared
+
+        # f'(x) = 3x^2 - 2*pnp*x
+        f_prime_x = 3 * x_squared - 2 * pnp * x
+
+        if f_prime_x == 0:
+            break
+
+        # Newton step
+        x_new = x - f_x // f_prime_x
+
+        # Check convergence (relative tolerance)
+        if abs(x_new - x) < max(1, x // 1000000):
+            x = x_new
+            break
+
+        x = x_new
+
+    return int(x)
+
+
+@lru_cache(maxsize=1024)
+def _find_initial_bounds(pnp_int: int) -> Tuple[int, int]:
+    """
+    Cached computation of (lower, upper) search bounds for the smaller factor.
+
+    See SemiPrimeEquationSolver.find_initial_bounds for the rationale.
+    """
+    pnp = gmpy2.mpz(pnp_int)
+    sqrt_pnp = int(gmpy2.isqrt(pnp))
+    digits = len(str(pnp))
+
+    # === UPPER BOUND ===
+    # Always sqrt(pnp) by mathematical necessity (smaller factor <= sqrt)
+    upper_bound = sqrt_pnp
+
+    # === LOWER BOUND ===
+    # Use Trurl's "find x when y=1" method to get the precise critical point
+
+    # Method 1: Solve for x where constraint equation y = 1
+    # This is Trurl's actual first step: "Find x on graph where y on graph equals 1"
+    try:
+        x_at_y_one = _find_x_when_y_equals_one(pnp_int)
+
+        # For balanced semiprimes (RSA-class), this gives us the approximate factor location
+        # Use this as a starting point, but add safety margin for search
+        # Start searching at 70% of this value to account for unbalanced factors
+        # Testing shows: 143=11×13 needs ~85%, 1189=29×41 needs ~81%, so 70% is safe
+        lower_bound_primary = int(x_at_y_one * 0.7)
+
+        # Verify this is in a reasonable range
+        if lower_bound_primary > 2 and lower_bound_primary < sqrt_pnp:
+            lower_bound = lower_bound_primary
+        else:
+            # Fallback to heuristic if y=1 method gives unreasonable value
+            raise ValueError("y=1 method out of range")
+
+    except Exception as e:
+        # Fallback: Trurl's empirical heuristic for RSA-260 (260 digits → 10^90)
+        # 90/260 ≈ 0.346, so we use d * 0.35
+        lower_exp_trurl = int(digits * 0.35)
+        lower_bound = int(gmpy2.mpz(10) ** lower_exp_trurl)
+
+    # Safety: never go below 2 (smallest prime)
+    lower_bound = max(2, int(lower_bound))
+
+    # Safety: never exceed sqrt(pnp)
+    lower_bound = min(lower_bound, sqrt_pnp - 1)
+
+    return int(lower_bound), int(upper_bound)
+
+
 class SemiPrimeEquationSolver:
     """
     Implementation of Trurl's equation-based semiprime factorization.
@@ -28,19 +151,47 @@ class SemiPrimeEquationSolver:
     the equation y = (((pnp^2/x) + x^2) / pnp) to establish search bounds.
     """
 
+    __slots__ = ('pnp', '_pnp_bits', '_pnp_squared', '_half_sq', '_sqrt',
+                 '_progress_bounds')
+
     def __init__(self, pnp: int):
         """
         Initialize solver for a semiprime.
 
         Args:
             pnp: The semiprime (product of two primes)
+
+        Derived values (pnp^2, isqrt) are multi-millisecond allocations for
+        1000-digit inputs, so they are computed lazily — API handlers that
+        only need one equation evaluation never pay for them.
         """
         self.pnp = gmpy2.mpz(pnp)
-        self.pnp_squared = self.pnp ** 2
-        self.sqrt_pnp = gmpy2.isqrt(self.pnp)
-
-        # High precision for floating-point bound calculations
-        getcontext().prec = max(200, len(str(pnp)) + 100)
+        self._pnp_bits = self.pnp.bit_length()
+        self._pnp_squared = None
+        self._half_sq = None
+        self._sqrt = None
+        self._progress_bounds = None
+
+    @property
+    def pnp_squared(self):
+        """pnp^2, computed on first use"""
+        if self._pnp_squared is None:
+            self._pnp_squared = gmpy2.square(self.pnp)
+        return self._pnp_squared
+
+    @property
+    def _half_pnp_sq(self):
+        """pnp^2 / 2 threshold for the decreasing-region test (shift, not division)"""
+        if self._half_sq is None:
+            self._half_sq = self.pnp_squared >> 1
+        return self._half_sq
+
+    @property
+    def sqrt_pnp(self):
+        """isqrt(pnp), computed on first use"""
+        if self._sqrt is None:
+            self._sqrt = gmpy2.isqrt(self.pnp)
+        return self._sqrt
 
     def compute_y_from_x(self, x: int) -> int:
         """
@@ -65,6 +216,32 @@ class SemiPrimeEquationSolver:
         y = numerator // self.pnp
         return int(y)
 
+    def compute_y_from_x_incremental(self, prev_x, prev_q, new_x):
+        """
+        Compute (pnp^2 // new_x, y) given the quotient at a nearby prev_x.
+
+        For ascending candidates with small gaps, seeding from the previous
+        quotient via q(x+d) ~ q(x) - q(x)*d/x and applying one exact
+        correction replaces the full 2N-by-N division with one roughly half
+        as wide plus a division of the short residual. The correction
+        q += (pnp^2 - q*new_x) // new_x is exact for any seed, so the
+        result always equals the direct quotient.
+
+        Args:
+            prev_x: Previous candidate
+            prev_q: pnp^2 // prev_x
+            new_x: Next candidate (larger than prev_x)
+
+        Returns:
+            Tuple (new_q, y) with new_q = pnp^2 // new_x
+        """
+        prev_x = gmpy2.mpz(prev_x)
+        new_x = gmpy2.mpz(new_x)
+        q = prev_q - (prev_q * (new_x - prev_x)) // prev_x
+        q += (self.pnp_squared - q * new_x) // new_x
+        y = (q + new_x * new_x) // self.pnp
+        return q, int(y)
+
     def compute_constraint_value(self, x: int) -> float:
         """
         Constraint equation: ((pnp^2/x + x^2) / x) / pnp
@@ -81,9 +258,10 @@ class SemiPrimeEquationSolver:
         x = gmpy2.mpz(x)
         # (pnp^2 / x) + x^2
         numerator = (self.pnp_squared // x) + (x * x)
-        # Divide by x, then by pnp using high-precision arithmetic
-        result_mpz = numerator // x // self.pnp
-        # For the fractional part, use Decimal for precision
+        # Divide by x*pnp in one step: a single division beats two successive
+        # ones (and skips the intermediate quotient allocation); for positive
+        # operands a // x // pnp == a // (x * pnp)
+        result_mpz = numerator // (x * self.pnp)
         try:
             result = float(result_mpz)
         except:
@@ -95,6 +273,82 @@ class SemiPrimeEquationSolver:
             result = 10.0 ** approx_log if approx_log < 300 else float('inf')
         return result
 
+    def compute_batch(self, xs) -> list:
+        """
+        Evaluate (y, constraint, is_factor) for a batch of x values.
+
+        Curve plotting calls compute_y_from_x / compute_constraint_value /
+        verify_factor once per point (up to 2000 points per request). This
+        fused loop computes the shared numerator (pnp^2/x + x^2) once per
+        point and binds the hot names locally, cutting the per-point
+        interpreter overhead roughly in half.
+
+        Args:
+            xs: Iterable of candidate x values
+
+        Returns:
+            List of (y, constraint, is_factor) tuples, one per x
+        """
+        pnp = self.pnp
+        pnp_squared = self.pnp_squared
+        mpz = gmpy2.mpz
+        is_divisible = gmpy2.is_divisible
+
+        results = []
+        append = results.append
+        prev_x = None
+        prev_q = None
+        for x in xs:
+            x = mpz(x)
+            # Ascending points with modest gaps reuse the previous quotient
+            # (see compute_y_from_x_incremental); otherwise divide directly
+            if prev_x is not None and prev_x < x < 2 * prev_x:
+                q = prev_q - (prev_q * (x - prev_x)) // prev_x
+                q += (pnp_squared - q * x) // x
+            else:
+                q = pnp_squared // x
+            prev_x, prev_q = x, q
+            numerator = q + (x * x)
+            y = int(numerator // pnp)
+            constraint_mpz = numerator // (x * pnp)
+            try:
+                constraint = float(constraint_mpz)
+            except (OverflowError, ValueError):
+                constraint = float('inf')
+            append((y, constraint, bool(is_divisible(pnp, x))))
+        return results
+
+    def compute_constraint_values_batch(self, xs) -> np.ndarray:
+        """
+        Evaluate the constraint equation over an array of candidates.
+
+        When pnp^2, x^2 and x*pnp all fit in int64, the whole sweep runs as
+        vectorized integer NumPy — one C pass over the array instead of a
+        Python call per candidate, with the same floor-division semantics
+        as compute_constraint_value. Wider operands fall back to the exact
+        per-element mpz path.
+
+        Args:
+            xs: Sequence or array of positive candidate x values
+
+        Returns:
+            Array of float constraint values, one per x
+        """
+        xs = np.asarray(xs)
+        if xs.size == 0:
+            return np.zeros(0)
+        max_x_bits = int(xs.max()).bit_length()
+        # Every intermediate must stay in int64: pnp^2, x*pnp, and — for
+        # candidates above pnp — the x*x term as well
+        if (2 * self._pnp_bits < 63 and 2 * max_x_bits < 63
+                and max_x_bits + self._pnp_bits < 63):
+            xs64 = xs.astype(np.int64)
+            pnp = np.int64(int(self.pnp))
+            pnp_sq = np.int64(int(self.pnp_squared))
+            numerator = pnp_sq // xs64 + xs64 * xs64
+            return (numerator // (xs64 * pnp)).astype(np.float64)
+        return np.array([self.compute_constraint_value(int(x)) for x in xs])
+
     def verify_inverse_relationship(self, x1: int, x2: int) -> bool:
         """
         Verify Trurl's key observation: x increases → y decreases.
@@ -141,9 +395,12 @@ class SemiPrimeEquationSolver:
         # For numerical stability with huge numbers, we use:
         # x_critical = pnp^(2/3) / 2^(1/3)
 
+        # Fast path: small pnp fits in a double, compute directly
+        if self._pnp_bits < 50:
+            return int((float(self.pnp) ** 2 / 2.0) ** (1.0 / 3.0))
+
         # Compute pnp^(2/3) using logarithms for huge numbers
         # Use string length for log10 approximation to avoid float overflow
-        import math
         pnp_digits = len(str(self.pnp))
         log_pnp = pnp_digits - 1  # Approximation
         log_critical = (2.0 / 3.0) * log_pnp - math.log10(2.0) / 3.0
@@ -165,10 +422,11 @@ class SemiPrimeEquationSolver:
         Returns:
             True if x is in the region where inverse relationship holds
         """
-        x_cubed = gmpy2.mpz(x) ** 3
-        threshold = self.pnp_squared // 2
+        x = gmpy2.mpz(x)
+        # square+mul beats GMP's general pow path for exponent 3
+        x_cubed = gmpy2.square(x) * x
 
-        return x_cubed < threshold
+        return x_cubed < self._half_pnp_sq
 
     def find_x_when_y_equals_one(self) -> int:
         """
@@ -195,40 +453,7 @@ class SemiPrimeEquationSolver:
         Returns:
             Approximate x value where constraint equation equals 1
         """
-        # Initial guess: x ≈ pnp^(2/3)
-        # This comes from the dominant term x^3 ≈ pnp^2 → x ≈ pnp^(2/3)
-        # Use string length for log10 approximation to avoid float overflow
-        pnp_digits = len(str(self.pnp))
-        log_pnp = pnp_digits - 1  # Approximation: log10(number) ≈ digits - 1
-        log_x_initial = (2.0 / 3.0) * log_pnp
-        x = gmpy2.mpz(10) ** int(log_x_initial)
-
-        # Newton's method: x_new = x - f(x)/f'(x)
-        max_iterations = 100
-        for iteration in range(max_iterations):
-            x_squared = x * x
-            x_cubed = x_squared * x
-
-            # f(x) = x^3 - pnp*x^2 + pnp^2
-            f_x = x_cubed - self.pnp * x_squared + self.pnp_squared
-
-            # f'(x) = 3x^2 - 2*pnp*x
-            f_prime_x = 3 * x_squared - 2 * self.pnp * x
-
-            if f_prime_x == 0:
-                break
-
-            # Newton step
-            x_new = x - f_x // f_prime_x
-
-            # Check convergence (relative tolerance)
-            if abs(x_new - x) < max(1, x // 1000000):
-                x = x_new
-                break
-
-            x = x_new
-
-        return int(x)
+        return _find_x_when_y_equals_one(int(self.pnp))
 
     def find_initial_bounds(self) -> Tuple[int, int]:
         """
@@ -252,47 +477,7 @@ class SemiPrimeEquationSolver:
         4. The search range must be in the decreasing region to ensure:
            "If you move x larger y gets smaller" - Trurl
         """
-        sqrt_pnp = int(self.sqrt_pnp)
-        digits = len(str(self.pnp))
-
-        # === UPPER BOUND ===
-        # Always sqrt(pnp) by mathematical necessity (smaller factor <= sqrt)
-        upper_bound = sqrt_pnp
-
-        # === LOWER BOUND ===
-        # Use Trurl's "find x when y=1" method to get the precise critical point
-
-        # Method 1: Solve for x where constraint equation y = 1
-        # This is Trurl's actual first step: "Find x on graph where y on graph equals 1"
-        try:
-            x_at_y_one = self.find_x_when_y_equals_one()
-
-            # For balanced semiprimes (RSA-class), this gives us the approximate factor location
-            # Use this as a starting point, but add safety margin for search
-            # Start searching at 70% of this value to account for unbalanced factors
-            # Testing shows: 143=11×13 needs ~85%, 1189=29×41 needs ~81%, so 70% is safe
-            lower_bound_primary = int(x_at_y_one * 0.7)
-
-            # Verify this is in a reasonable range
-            if lower_bound_primary > 2 and lower_bound_primary < sqrt_pnp:
-                lower_bound = lower_bound_primary
-            else:
-                # Fallback to heuristic if y=1 method gives unreasonable value
-                raise ValueError("y=1 method out of range")
-
-        except Exception as e:
-            # Fallback: Trurl's empirical heuristic for RSA-260 (260 digits → 10^90)
-            # 90/260 ≈ 0.346, so we use d * 0.35
-            lower_exp_trurl = int(digits * 0.35)
-            lower_bound = int(gmpy2.mpz(10) ** lower_exp_trurl)
-
-        # Safety: never go below 2 (smallest prime)
-        lower_bound = max(2, int(lower_bound))
-
-        # Safety: never exceed sqrt(pnp)
-        lower_bound = min(lower_bound, sqrt_pnp - 1)
-
-        return int(lower_bound), int(upper_bound)
+        return _find_initial_bounds(int(self.pnp))
 
     def verify_factor(self, x: int) -> bool:
         """
@@ -304,7 +489,8 @@ class SemiPrimeEquationSolver:
         Returns:
             True if x divides pnp evenly
         """
-        return self.pnp % x == 0
+        # mpz_divisible_p: remainder-only test, skips building the quotient
+        return gmpy2.is_divisible(self.pnp, x)
 
     def get_complementary_factor(self, x: int) -> Optional[int]:
         """
@@ -317,7 +503,8 @@ class SemiPrimeEquationSolver:
             The complementary factor y, or None if x doesn't divide pnp
         """
         if self.verify_factor(x):
-            return int(self.pnp // x)
+            # Division is known exact here; mpz_divexact is ~2x faster than //
+            return int(gmpy2.divexact(self.pnp, x))
         return None
 
     def verify_all_constraints(self, x: int, y: int) -> Dict[str, bool]:
@@ -408,9 +595,14 @@ class SemiPrimeEquationSolver:
             return 100.0
 
         try:
-            log_current = math.log10(max(1, current))
-            log_lower = math.log10(max(1, lower))
-            log_upper = math.log10(max(1, upper))
+            # The bounds are fixed for the lifetime of a search; cache their
+            # logs so the per-poll cost is one log of the moving candidate
+            cached = self._progress_bounds
+            if cached is None or cached[0] != lower or cached[1] != upper:
+                cached = (lower, upper, _log10_big(lower), _log10_big(upper))
+                self._progress_bounds = cached
+            log_lower, log_upper = cached[2], cached[3]
+            log_current = _log10_big(current)
 
             if log_upper <= log_lower:
                 return 100.0
@@ -430,8 +622,6 @@ class SemiPrimeEquationSolver:
         Returns:
             Diagnostic data with mathematical analysis
         """
-        import math
-
         report = {
             'pnp': str(self.pnp),
             'pnp_digits': len(str(self.pnp)),
@@ -3,9 +3,12 @@ FastAPI application main entry point
 """
 from fastapi import FastAPI, Depends, HTTPException, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Any, List
+from decimal import Decimal
+import orjson
 import os
 import uuid
 import csv
@@ -29,11 +32,33 @@ engine = get_engine(DATABASE_URL)
 SessionFactory = get_session_factory(engine)
 init_db(engine)
 
+def _orjson_default(obj: Any) -> str:
+    """Serialize types orjson doesn't handle natively (Decimal, gmpy2.mpz) as strings"""
+    if isinstance(obj, Decimal):
+        return str(obj)
+    # gmpy2.mpz and other big-integer types from diagnostic payloads
+    if hasattr(obj, '__int__'):
+        return str(int(obj))
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+class BigNumORJSONResponse(ORJSONResponse):
+    """ORJSONResponse that stringifies Decimal/mpz values in diagnostic payloads"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            default=_orjson_default,
+            option=orjson.OPT_SERIALIZE_NUMPY
+        )
+
+
 # Create FastAPI app
 app = FastAPI(
     title="SemiPrime Factor API",
     description="High-performance factorization service with equation-guided search",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=BigNumORJSONResponse
 )
 
 # CORS middleware
@@ -45,6 +70,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large JSON payloads (equation diagnostics carry multi-KB integer strings)
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Include routers
 app.include_router(jobs.router, prefix="/api", tags=["jobs"])
 app.include_router(health.router, prefix="/api", tags=["health"])
@@ -1,7 +1,8 @@
 """
 Database models using SQLAlchemy
 """
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Text, Boolean, ForeignKey, BigInteger, Enum, JSON
+from sqlalchemy import create_engine, Column, Integer, String, DateTime, Text, Boolean, ForeignKey, BigInteger, Enum, Index, JSON, LargeBinary
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
 from datetime import datetime
@@ -9,6 +10,13 @@ import enum
 
 Base = declarative_base()
 
+# JSONB on Postgres (binary storage, no text re-parse on read); plain JSON elsewhere
+JSONVariant = JSON().with_variant(JSONB(), "postgresql")
+
+# Native 16-byte UUID on Postgres (vs 36 bytes as text, >2x smaller indexes);
+# plain string elsewhere. as_uuid=False keeps str in/out for existing callers.
+UUIDVariant = UUID(as_uuid=False).with_variant(String(36), "sqlite")
+
 
 class JobStatus(str, enum.Enum):
     """Job status enumeration"""
@@ -32,13 +40,19 @@ class Job(Base):
     """Main job table"""
     __tablename__ = "jobs"
 
-    id = Column(String(36), primary_key=True)  # UUID
-    created_at = Column(DateTime, default=datetime.utcnow)
+    id = Column(UUIDVariant, primary_key=True)  # UUID
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
     started_at = Column(DateTime, nullable=True)
     finished_at = Column(DateTime, nullable=True)
 
     # Input
     n = Column(Text, nullable=False)  # The semiprime to factor (stored as string for huge numbers)
+    # Binary form and digit count, captured once at creation: workers read
+    # n_bytes to skip the O(d^2) decimal parse on task start and n_digits to
+    # skip re-stringifying n just to count digits. Nullable so rows created
+    # before these columns existed keep working via the text fallback.
+    n_bytes = Column(LargeBinary, nullable=True)
+    n_digits = Column(Integer, nullable=True)
     mode = Column(Enum(JobMode), nullable=False, default=JobMode.AUTO)
     lower_bound = Column(Text, nullable=True)
     upper_bound = Column(Text, nullable=True)
@@ -50,13 +64,13 @@ class Job(Base):
     use_equation = Column(Boolean, default=True)  # Enable equation-based bounds
 
     # Status
-    status = Column(Enum(JobStatus), default=JobStatus.PENDING)
+    status = Column(Enum(JobStatus), default=JobStatus.PENDING, index=True)
     progress_percent = Column(Integer, default=0)
     current_candidate = Column(Text, nullable=True)
     error_message = Column(Text, nullable=True)
 
     # Results
-    factors_found = Column(JSON, nullable=True)  # List of factors
+    factors_found = Column(JSONVariant, nullable=True)  # List of factors
     total_time_seconds = Column(Integer, nullable=True)
 
     # Relationships
@@ -82,8 +96,12 @@ class JobLog(Base):
     """Job execution logs"""
     __tablename__ = "job_logs"
 
+    __table_args__ = (
+        Index('ix_job_logs_job_ts', 'job_id', 'timestamp'),
+    )
+
     id = Column(Integer, primary_key=True, autoincrement=True)
-    job_id = Column(String(36), ForeignKey("jobs.id", ondelete="CASCADE"))
+    job_id = Column(UUIDVariant, ForeignKey("jobs.id", ondelete="CASCADE"), index=True)
     timestamp = Column(DateTime, default=datetime.utcnow)
     level = Column(String(20))  # INFO, WARNING, ERROR, DEBUG
     message = Column(Text)
@@ -102,11 +120,18 @@ class JobResult(Base):
     """Factorization results"""
     __tablename__ = "job_results"
 
+    __table_args__ = (
+        Index('ix_job_results_job_found', 'job_id', 'found_at'),
+    )
+
     id = Column(Integer, primary_key=True, autoincrement=True)
-    job_id = Column(String(36), ForeignKey("jobs.id", ondelete="CASCADE"))
+    job_id = Column(UUIDVariant, ForeignKey("jobs.id", ondelete="CASCADE"), index=True)
     factor = Column(Text, nullable=False)
     is_prime = Column(Boolean, nullable=True)
-    certificate = Column(Text, nullable=True)  # Primality certificate if available
+    # Primality certificate if available. Stored structured (JSONB on
+    # Postgres) so the worker inserts the cert dict as-is instead of paying
+    # for an indent=2 json.dumps per factor on the hot recording path.
+    certificate = Column(JSONVariant, nullable=True)
     found_at = Column(DateTime, default=datetime.utcnow)
     found_by_algorithm = Column(String(50))  # Which algorithm found it
     elapsed_ms = Column(Integer)  # Time to find this factor
@@ -146,11 +171,14 @@ class EquationSnapshot(Base):
     __tablename__ = "equation_snapshots"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    job_id = Column(String(36), ForeignKey("jobs.id", ondelete="CASCADE"))
+    job_id = Column(UUIDVariant, ForeignKey("jobs.id", ondelete="CASCADE"))
     x_min = Column(Text)
     x_max = Column(Text)
     step = Column(Integer)
-    points_blob = Column(JSON)  # Array of {x, y, constraint, is_candidate, is_factor}
+    points_blob = Column(JSONVariant, nullable=True)  # Legacy JSON array of point dicts
+    # MessagePack-encoded point array (BYTEA): ~3-5x smaller and much faster
+    # to decode than JSONB for multi-thousand-point curves
+    points_blob_msgpack = Column(LargeBinary, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
 
@@ -159,12 +187,12 @@ class JobRun(Base):
     __tablename__ = "job_runs"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    job_id = Column(String(36), ForeignKey("jobs.id", ondelete="CASCADE"))
+    job_id = Column(UUIDVariant, ForeignKey("jobs.id", ondelete="CASCADE"), index=True)
     algorithm = Column(String(50), nullable=False)  # rho, ecm, fermat, equation
-    status = Column(String(20), default="pending")  # pending, running, completed, cancelled, failed
+    status = Column(String(20), default="pending", index=True)  # pending, running, completed, cancelled, failed
     started_at = Column(DateTime, nullable=True)
     finished_at = Column(DateTime, nullable=True)
-    metrics_json = Column(JSON, nullable=True)  # {iterations, curves_done, candidates_tested, etc}
+    metrics_json = Column(JSONVariant, nullable=True)  # {iterations, curves_done, candidates_tested, etc}
     result = Column(Text, nullable=True)  # Factor if found
 
 
@@ -187,15 +215,38 @@ SessionFactory = None
 
 
 # Database connection helper
-def get_engine(database_url: str):
-    """Create database engine"""
-    return create_engine(database_url, pool_pre_ping=True)
+def get_engine(database_url: str, pool_size: int = 20, max_overflow: int = 40):
+    """Create database engine with connection pooling and statement caching
+
+    The defaults suit the API process; single-task contexts (e.g. a forked
+    Celery worker process) should pass a smaller pool.
+    """
+    connect_args = {}
+    pool_kwargs = {"pool_size": pool_size, "max_overflow": max_overflow}
+    if database_url.startswith("postgresql"):
+        # Bound runaway queries server-side (30s)
+        connect_args["options"] = "-c statement_timeout=30000"
+    elif database_url.startswith("sqlite"):
+        # SQLite (unit tests) picks its own pool class, which rejects the
+        # Postgres-oriented sizing arguments
+        pool_kwargs = {}
+    return create_engine(
+        database_url,
+        pool_pre_ping=True,
+        pool_recycle=1800,
+        query_cache_size=1200,
+        connect_args=connect_args,
+        **pool_kwargs,
+    )
 
 
 def get_session_factory(engine):
     """Create session factory"""
     global SessionFactory
-    SessionFactory = sessionmaker(bind=engine)
+    # expire_on_commit=False: sessions here are request/loop scoped and rows
+    # are not reused across commits, so there is no need to mark every loaded
+    # attribute stale (and trigger a reload SELECT) after each commit
+    SessionFactory = sessionmaker(bind=engine, expire_on_commit=False)
     return SessionFactory
 
 
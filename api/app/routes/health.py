@@ -11,6 +11,13 @@ from app.models.schemas import HealthResponse
 
 router = APIRouter()
 
+# Shared connection pool: liveness probes hit /health every few seconds and
+# a fresh TCP connection per probe is pure overhead
+_redis_pool = redis.ConnectionPool.from_url(
+    os.getenv("REDIS_URL", "redis://localhost:6379/0"),
+    max_connections=10
+)
+
 
 def get_db():
     """Dependency for database session"""
@@ -52,21 +59,21 @@ async def health_check(db: Session = Depends(get_db)):
 
     # Check Redis
     try:
-        redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
-        r = redis.from_url(redis_url)
+        r = redis.Redis(connection_pool=_redis_pool)
         r.ping()
         status["redis"] = "healthy"
     except Exception as e:
         status["redis"] = f"unhealthy: {str(e)}"
         status["status"] = "degraded"
 
-    # Check Celery worker (simplified)
+    # Check Celery workers via their Redis heartbeat keys — a single scan,
+    # unlike inspect().stats() which broadcasts to all workers and blocks
+    # for up to the reply timeout
     try:
-        from app.worker import celery_app
-        inspect = celery_app.control.inspect()
-        stats = inspect.stats()
-        if stats:
-            status["worker"] = f"healthy ({len(stats)} workers)"
+        r = redis.Redis(connection_pool=_redis_pool)
+        workers = sum(1 for _ in r.scan_iter("worker:*:alive", count=100))
+        if workers:
+            status["worker"] = f"healthy ({workers} workers)"
         else:
             status["worker"] = "no workers available"
             status["status"] = "degraded"
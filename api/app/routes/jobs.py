@@ -2,14 +2,20 @@
 Job management routes
 """
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from typing import List
+import orjson
+import redis.asyncio as aioredis
 import uuid
 import csv
 import io
 import os
 import json
 
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
 from app.models import Job, JobLog, JobResult, Upload, JobStatus
 from app.models.schemas import (
     JobCreate, JobResponse, JobControlAction,
@@ -20,6 +26,42 @@ from app.services.job_service import JobService
 router = APIRouter()
 
 
+def _job_to_response(job: Job) -> JobResponse:
+    """
+    Build a JobResponse from a trusted ORM row without field-by-field
+    re-validation.
+
+    DB rows already satisfy the schema, so model_construct skips the
+    Pydantic validation pass (including the JSON-dict → AlgorithmPolicy /
+    ECMParams re-wrapping) that otherwise runs per row on every listing.
+    """
+    from app.models.schemas import AlgorithmPolicy, ECMParams
+
+    policy = job.algorithm_policy
+    ecm = job.ecm_params
+    return JobResponse.model_construct(
+        id=job.id,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        completed_at=job.finished_at,
+        finished_at=job.finished_at,
+        n=job.n,
+        mode=job.mode,
+        lower_bound=job.lower_bound,
+        upper_bound=job.upper_bound,
+        status=job.status,
+        progress_percent=job.progress_percent,
+        current_candidate=job.current_candidate,
+        error_message=job.error_message,
+        factors_found=job.factors_found,
+        total_time_seconds=job.total_time_seconds,
+        elapsed_seconds=job.elapsed_seconds,
+        use_equation=job.use_equation,
+        algorithm_policy=AlgorithmPolicy.model_construct(**policy) if policy else AlgorithmPolicy(),
+        ecm_params=ECMParams.model_construct(**ecm) if ecm else ECMParams(),
+    )
+
+
 def get_db():
     """Dependency for database session"""
     from app.main import SessionFactory
@@ -44,7 +86,7 @@ async def create_job(job_data: JobCreate, db: Session = Depends(get_db)):
     """
     service = JobService(db)
     job = service.create_job(job_data)
-    return job
+    return _job_to_response(job)
 
 
 @router.get("/jobs", response_model=List[JobResponse])
@@ -61,7 +103,7 @@ async def list_jobs(skip: int = 0, limit: int = 100, db: Session = Depends(get_d
         List of jobs
     """
     jobs = db.query(Job).order_by(Job.created_at.desc()).offset(skip).limit(limit).all()
-    return jobs
+    return [_job_to_response(job) for job in jobs]
 
 
 @router.get("/jobs/{job_id}", response_model=JobResponse)
@@ -79,7 +121,7 @@ async def get_job(job_id: str, db: Session = Depends(get_db)):
     job = db.query(Job).filter(Job.id == job_id).first()
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
-    return job
+    return _job_to_response(job)
 
 
 @router.post("/jobs/{job_id}/control")
@@ -114,29 +156,70 @@ async def get_job_logs(
     job_id: str,
     skip: int = 0,
     limit: int = 1000,
+    after_id: int = None,
+    format: str = "json",
     db: Session = Depends(get_db)
 ):
     """
     Get job execution logs.
 
+    Prefer cursor pagination: pass the smallest log id from the previous
+    page as after_id to get the next (older) page. OFFSET pagination is
+    kept for compatibility but reads and discards `skip` rows server-side,
+    which degrades linearly on jobs with large log volumes.
+
+    With format=ndjson the response streams one JSON object per line as
+    rows come off a server-side cursor, so memory stays constant and the
+    first byte arrives before the query finishes. The default JSON-array
+    response is kept for existing clients (the frontend log viewer).
+
     Args:
         job_id: Job UUID
-        skip: Number of records to skip
+        skip: Number of records to skip (legacy OFFSET pagination)
         limit: Maximum records to return
+        after_id: Keyset cursor — return logs with id < after_id
+        format: "json" (buffered array, default) or "ndjson" (streamed)
         db: Database session
 
     Returns:
-        List of log entries
+        List of log entries, newest first
     """
     job = db.query(Job).filter(Job.id == job_id).first()
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
 
-    logs = db.query(JobLog).filter(
-        JobLog.job_id == job_id
-    ).order_by(JobLog.timestamp.desc()).offset(skip).limit(limit).all()
+    query = db.query(JobLog).filter(JobLog.job_id == job_id)
 
-    return logs
+    if after_id is not None:
+        # Keyset pagination: O(limit) rows via the (job_id, id) index path;
+        # id order matches timestamp order since ids are monotonic
+        query = query.filter(JobLog.id < after_id).order_by(
+            JobLog.id.desc()
+        ).limit(limit)
+    else:
+        query = query.order_by(
+            JobLog.timestamp.desc()
+        ).offset(skip).limit(limit)
+
+    if format == "ndjson":
+        def _gen():
+            # yield_per streams rows in windows of 500 instead of loading
+            # the whole result set; orjson handles datetimes natively
+            try:
+                for log in query.yield_per(500):
+                    yield orjson.dumps({
+                        "timestamp": log.timestamp,
+                        "level": log.level,
+                        "message": log.message,
+                        "stage": log.stage,
+                        "payload": log.payload,
+                    }) + b"\n"
+            finally:
+                db.close()
+
+        return StreamingResponse(_gen(), media_type="application/x-ndjson")
+
+    return query.all()
 
 
 @router.get("/jobs/{job_id}/results", response_model=List[JobResultEntry])
@@ -164,12 +247,33 @@ async def stream_job_logs(websocket: WebSocket, job_id: str):
     """
     WebSocket endpoint for real-time job logs and progress.
 
+    The worker publishes each log entry to the Redis channel
+    job:{job_id}:events; this endpoint backfills existing logs from the
+    database once on connect, then forwards published events. Postgres is
+    only re-queried on a slow (~10s) fallback tick to detect completion,
+    instead of the old 1 query/sec/client polling loop.
+
+    Postgres LISTEN/NOTIFY (trigger on job_logs + asyncpg add_listener)
+    would deliver the same push semantics without Redis, but Redis is
+    already a hard dependency (Celery broker), NOTIFY payloads are capped
+    at 8000 bytes so full log events would need a second round trip, and
+    the ORM stack here is sync psycopg2 — a dedicated asyncpg listen
+    connection per job would be new infrastructure, not reuse.
+
     Args:
         websocket: WebSocket connection
         job_id: Job UUID
     """
     await websocket.accept()
 
+    async def send_event(payload: dict):
+        # orjson is 3-10x faster than stdlib json here and serializes
+        # datetimes natively; decode keeps the frames as text for browsers
+        await websocket.send_text(orjson.dumps(payload).decode())
+
+    redis_conn = None
+    pubsub = None
+
     try:
         # Get database session
         from app.main import SessionFactory
@@ -178,50 +282,88 @@ async def stream_job_logs(websocket: WebSocket, job_id: str):
         # Verify job exists
         job = db.query(Job).filter(Job.id == job_id).first()
         if not job:
-            await websocket.send_json({"error": "Job not found"})
+            await send_event({"error": "Job not found"})
             await websocket.close()
             return
 
-        # Stream logs and progress
+        # Subscribe before backfilling so no event can fall in the gap
+        redis_conn = aioredis.from_url(REDIS_URL)
+        pubsub = redis_conn.pubsub()
+        await pubsub.subscribe(f"job:{job_id}:events")
+
+        # Backfill logs already in the database
         last_log_id = 0
+        for log in db.query(JobLog).filter(
+            JobLog.job_id == job_id
+        ).order_by(JobLog.id).all():
+            # Pass the datetime through: orjson formats it in C, skipping a
+            # Python-level isoformat() call per backfilled log
+            await send_event({
+                "type": "log",
+                "timestamp": log.timestamp,
+                "level": log.level,
+                "message": log.message,
+                "stage": log.stage,
+                "payload": log.payload
+            })
+            last_log_id = log.id
+
+        # Initial progress snapshot
+        await send_event({
+            "type": "progress",
+            "status": job.status.value,
+            "progress_percent": job.progress_percent,
+            "current_candidate": job.current_candidate
+        })
+
+        if job.status in [JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED]:
+            await send_event({"type": "complete", "status": job.status.value})
+            db.close()
+            return
 
+        idle_ticks = 0
         while True:
-            # Refresh job status
-            db.refresh(job)
-
-            # Get new logs
-            new_logs = db.query(JobLog).filter(
-                JobLog.job_id == job_id,
-                JobLog.id > last_log_id
-            ).order_by(JobLog.id).all()
-
-            for log in new_logs:
-                await websocket.send_json({
-                    "type": "log",
-                    "timestamp": log.timestamp.isoformat(),
-                    "level": log.level,
-                    "message": log.message,
-                    "stage": log.stage,
-                    "payload": log.payload
+            message = await pubsub.get_message(
+                ignore_subscribe_messages=True, timeout=1.0
+            )
+
+            if message and message.get("type") == "message":
+                idle_ticks = 0
+                event = json.loads(message["data"])
+                # Skip events already sent during backfill; buffered worker
+                # logs publish before their INSERT and carry no id yet
+                event_id = event.get("id")
+                if event.get("type") == "log" and event_id is not None \
+                        and event_id <= last_log_id:
+                    continue
+                if event.get("id"):
+                    last_log_id = event["id"]
+                await send_event(event)
+                continue
+
+            # Fallback tick: confirm status from the database every ~10s of
+            # silence so a missed event can't strand the client
+            idle_ticks += 1
+            if idle_ticks >= 10:
+                idle_ticks = 0
+                # Re-read only the mutable columns instead of db.refresh(job),
+                # which reloads the full row (including n, which can be
+                # thousands of digits) through the ORM identity map. A typed
+                # Core select (not raw text SQL) lets the Enum column decode
+                # status back to a JobStatus member.
+                status_val, progress, candidate = db.execute(
+                    select(Job.status, Job.progress_percent, Job.current_candidate)
+                    .where(Job.id == job_id)
+                ).one()
+                await send_event({
+                    "type": "progress",
+                    "status": status_val.value,
+                    "progress_percent": progress,
+                    "current_candidate": candidate
                 })
-                last_log_id = log.id
-
-            # Send progress update
-            await websocket.send_json({
-                "type": "progress",
-                "status": job.status.value,
-                "progress_percent": job.progress_percent,
-                "current_candidate": job.current_candidate
-            })
-
-            # Exit if job is complete
-            if job.status in [JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED]:
-                await websocket.send_json({"type": "complete", "status": job.status.value})
-                break
-
-            # Wait before next update
-            import asyncio
-            await asyncio.sleep(1)
+                if status_val in [JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED]:
+                    await send_event({"type": "complete", "status": status_val.value})
+                    break
 
         db.close()
 
@@ -230,6 +372,17 @@ async def stream_job_logs(websocket: WebSocket, job_id: str):
     except Exception as e:
         print(f"WebSocket error: {e}")
     finally:
+        if pubsub is not None:
+            try:
+                await pubsub.unsubscribe(f"job:{job_id}:events")
+                await pubsub.aclose()
+            except Exception:
+                pass
+        if redis_conn is not None:
+            try:
+                await redis_conn.aclose()
+            except Exception:
+                pass
         await websocket.close()
 
 
@@ -257,22 +410,24 @@ async def upload_csv(file: UploadFile = File(...), db: Session = Depends(get_db)
     # Save file
     file_path = os.path.join(upload_dir, f"{token}.csv")
 
-    # Read and validate CSV
-    content = await file.read()
-    text_content = content.decode('utf-8')
+    # Stream to disk in 1MB chunks, counting rows on the fly — avoids
+    # holding bytes + decoded text + parsed rows in memory for large files
+    row_count = 0
+    last_byte = b''
+    with open(file_path, 'wb') as f:
+        while chunk := await file.read(1 << 20):
+            f.write(chunk)
+            row_count += chunk.count(b'\n')
+            last_byte = chunk[-1:]
 
-    # Count rows
-    reader = csv.reader(io.StringIO(text_content))
-    rows = list(reader)
-    row_count = len([r for r in rows if r])  # Non-empty rows
+    # Final row may lack a trailing newline
+    if last_byte and last_byte != b'\n':
+        row_count += 1
 
     if row_count == 0:
+        os.remove(file_path)
         raise HTTPException(status_code=400, detail="CSV file is empty")
 
-    # Save to disk
-    with open(file_path, 'w') as f:
-        f.write(text_content)
-
     # Store upload record
     upload = Upload(
         token=token,
@@ -1,7 +1,10 @@
 """
 Job service for business logic
 """
+from sqlalchemy import insert, update
 from sqlalchemy.orm import Session
+import os
+import redis
 import uuid
 from datetime import datetime
 
@@ -9,6 +12,24 @@ from app.models import Job, JobLog, JobResult, JobStatus, JobMode
 from app.models.schemas import JobCreate
 from app.worker import run_factorization_task
 
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+# Shared client for control-channel publishes (best-effort, like the
+# worker's event publisher)
+_control_redis = None
+
+
+def _publish_control(job_id: str, action: str):
+    """Notify the worker of a control action via Redis pub/sub"""
+    global _control_redis
+    try:
+        if _control_redis is None:
+            _control_redis = redis.from_url(REDIS_URL)
+        _control_redis.publish(f"job:{job_id}:control", action)
+    except Exception:
+        # The DB status poll remains the fallback path
+        _control_redis = None
+
 
 class JobService:
     """Service for managing factorization jobs"""
@@ -29,10 +50,16 @@ class JobService:
         # Generate job ID
         job_id = str(uuid.uuid4())
 
+        # Parse n once here so workers can load it as bytes (no repeated
+        # decimal parse) and read the digit count as a column
+        n_int = int(job_data.n)
+
         # Create job record
         job = Job(
             id=job_id,
             n=job_data.n,
+            n_bytes=n_int.to_bytes(max(1, (n_int.bit_length() + 7) // 8), "little"),
+            n_digits=len(job_data.n),
             mode=JobMode(job_data.mode.value),
             lower_bound=job_data.lower_bound,
             upper_bound=job_data.upper_bound,
@@ -43,68 +70,94 @@ class JobService:
             status=JobStatus.PENDING
         )
 
+        # Flush the job row (so the log's FK resolves), write the creation
+        # log, then commit both in one round-trip
         self.db.add(job)
-        self.db.commit()
-        self.db.refresh(job)
-
-        # Log job creation
+        self.db.flush()
         self._add_log(job_id, "INFO", "Job created", "initialization")
+        self.db.commit()
 
         # Enqueue Celery task
         run_factorization_task.delay(job_id)
 
         return job
 
-    def pause_job(self, job_id: str) -> Job:
-        """Pause a running job"""
+    def _transition(self, job_id: str, from_statuses, values: dict) -> Job:
+        """
+        Apply a status transition with a single conditional UPDATE ... RETURNING.
+
+        The old load-then-mutate pattern cost a SELECT plus an UPDATE (and
+        hydrated the full row) per control request; the guarded UPDATE is one
+        round-trip and the status predicate makes the transition atomic under
+        concurrent control requests. Returns the updated Job, or None when no
+        row matched (missing job or wrong state — callers disambiguate).
+        """
+        stmt = (
+            update(Job)
+            .where(Job.id == job_id, Job.status.in_(from_statuses))
+            .values(**values)
+            .returning(Job)
+        )
+        return self.db.execute(stmt).scalar_one_or_none()
+
+    def _get_job_or_raise(self, job_id: str) -> Job:
+        """Fetch a job after a no-op transition to distinguish not-found from wrong-state"""
         job = self.db.query(Job).filter(Job.id == job_id).first()
         if not job:
             raise ValueError("Job not found")
+        return job
 
-        if job.status == JobStatus.RUNNING:
-            job.status = JobStatus.PAUSED
-            self._add_log(job_id, "INFO", "Job paused by user", "control")
-            self.db.commit()
+    def pause_job(self, job_id: str) -> Job:
+        """Pause a running job"""
+        job = self._transition(job_id, [JobStatus.RUNNING], {"status": JobStatus.PAUSED})
+        if job is None:
+            return self._get_job_or_raise(job_id)
 
+        self._add_log(job_id, "INFO", "Job paused by user", "control")
+        self.db.commit()
         return job
 
     def resume_job(self, job_id: str) -> Job:
         """Resume a paused job"""
-        job = self.db.query(Job).filter(Job.id == job_id).first()
-        if not job:
-            raise ValueError("Job not found")
-
-        if job.status == JobStatus.PAUSED:
-            job.status = JobStatus.RUNNING
-            self._add_log(job_id, "INFO", "Job resumed by user", "control")
-            self.db.commit()
-            # Re-enqueue task
-            run_factorization_task.delay(job_id)
+        job = self._transition(job_id, [JobStatus.PAUSED], {"status": JobStatus.RUNNING})
+        if job is None:
+            return self._get_job_or_raise(job_id)
 
+        self._add_log(job_id, "INFO", "Job resumed by user", "control")
+        self.db.commit()
+        # Re-enqueue task
+        run_factorization_task.delay(job_id)
         return job
 
     def cancel_job(self, job_id: str) -> Job:
         """Cancel a job"""
-        job = self.db.query(Job).filter(Job.id == job_id).first()
-        if not job:
-            raise ValueError("Job not found")
-
-        if job.status in [JobStatus.PENDING, JobStatus.RUNNING, JobStatus.PAUSED]:
-            job.status = JobStatus.CANCELLED
-            job.finished_at = datetime.utcnow()
-            self._add_log(job_id, "INFO", "Job cancelled by user", "control")
-            self.db.commit()
+        job = self._transition(
+            job_id,
+            [JobStatus.PENDING, JobStatus.RUNNING, JobStatus.PAUSED],
+            {"status": JobStatus.CANCELLED, "finished_at": datetime.utcnow()}
+        )
+        if job is None:
+            return self._get_job_or_raise(job_id)
 
+        self._add_log(job_id, "INFO", "Job cancelled by user", "control")
+        self.db.commit()
+        # Push the cancel to the worker immediately; the status row above is
+        # the durable record it falls back to
+        _publish_control(job_id, "cancel")
         return job
 
     def _add_log(self, job_id: str, level: str, message: str, stage: str = None, payload: dict = None):
-        """Add a log entry"""
-        log = JobLog(
-            job_id=job_id,
-            level=level,
-            message=message,
-            stage=stage,
-            payload=payload
-        )
-        self.db.add(log)
-        self.db.commit()
+        """
+        Add a log entry via a Core insert (no ORM unit-of-work overhead).
+
+        Does not commit: callers batch the log with their own writes into a
+        single commit, halving round-trips on the control path.
+        """
+        self.db.execute(insert(JobLog.__table__), [{
+            "job_id": job_id,
+            "timestamp": datetime.utcnow(),
+            "level": level,
+            "message": message,
+            "stage": stage,
+            "payload": payload,
+        }])
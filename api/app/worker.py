@@ -2,13 +2,94 @@
 Celery worker for factorization tasks
 """
 from celery import Celery
+from celery.signals import worker_process_init, worker_ready
+from sqlalchemy import insert, select, update
+from functools import lru_cache
+import gmpy2
+import hashlib
+import json
 import os
+import redis
+import socket
+import threading
 from datetime import datetime
 import time
+import uuid
+
+from app.models import (
+    Job, JobLog, JobResult, JobStatus, get_engine, get_session_factory
+)
 
 # Celery configuration
 CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0")
 CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND", "redis://localhost:6379/1")
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+DATABASE_URL = os.getenv("DATABASE_URL", "postgresql://factor:factor_dev_password@db:5432/factordb")
+
+# One engine per worker process, created after the prefork (engines must not
+# cross a fork) and reused by every task the process runs
+_engine = None
+_SessionFactory = None
+
+
+@worker_process_init.connect
+def _init_db_engine(**kwargs):
+    """Build the per-process engine + session factory once, post-fork
+
+    Each prefork child runs one task at a time (prefetch 1, acks late),
+    so the API-sized pool of 20+40 connections per process would only
+    hold Postgres slots hostage; a couple of connections suffice.
+    """
+    global _engine, _SessionFactory
+    _engine = get_engine(DATABASE_URL, pool_size=2, max_overflow=3)
+    _SessionFactory = get_session_factory(_engine)
+
+
+def _get_session():
+    """Session from the process-wide factory (built lazily under eager/test runs)
+
+    autoflush is off for task sessions: the hot loops interleave reads
+    (cancellation polls) with pending ORM mutations on the job row, and
+    autoflush would emit an UPDATE before every such read. Flushes happen
+    explicitly at the commit points the task already has.
+    """
+    global _engine, _SessionFactory
+    if _SessionFactory is None:
+        _init_db_engine()
+    return _SessionFactory(autoflush=False)
+
+# Shared client for publishing job events to WebSocket subscribers
+_event_redis = None
+
+
+def _publish_job_event(job_id: str, event: dict):
+    """Publish a job event to Redis for live WebSocket streaming (best-effort)"""
+    global _event_redis
+    try:
+        if _event_redis is None:
+            _event_redis = redis.from_url(REDIS_URL)
+        _event_redis.publish(f"job:{job_id}:events", json.dumps(event, default=str))
+    except Exception:
+        # Streaming is advisory; never fail the job over a pub/sub hiccup
+        _event_redis = None
+
+
+def _stream_raw_log(job_id: str, line: str):
+    """Append a raw tool output line to the job's Redis stream (best-effort)
+
+    High-frequency tool chatter (CADO-NFS emits thousands of lines per
+    minute) is retained in a capped stream instead of one Postgres row per
+    line; XADD with an approximate MAXLEN is O(1) and trims lazily.
+    """
+    global _event_redis
+    try:
+        if _event_redis is None:
+            _event_redis = redis.from_url(REDIS_URL)
+        _event_redis.xadd(
+            f"job:{job_id}:log", {"line": line}, maxlen=100_000, approximate=True
+        )
+    except Exception:
+        _event_redis = None
 
 celery_app = Celery(
     "factor_worker",
@@ -17,13 +98,536 @@ celery_app = Celery(
 )
 
 celery_app.conf.update(
-    task_serializer='json',
-    accept_content=['json'],
-    result_serializer='json',
+    # msgpack encodes the 200+ digit n_str payloads and result dicts a few
+    # times faster than JSON and produces smaller broker messages; json
+    # stays accepted so in-flight tasks survive a rolling deploy. Not
+    # pickle: the queue shouldn't become an arbitrary-code sink just to
+    # save a serializer pass.
+    task_serializer='msgpack',
+    accept_content=['msgpack', 'json'],
+    result_serializer='msgpack',
     timezone='UTC',
     enable_utc=True,
+    # Pool broker connections in the API process so each .delay() reuses an
+    # open Redis connection instead of paying a fresh TCP+AUTH handshake
+    broker_pool_limit=10,
+    broker_connection_retry_on_startup=True,
+    broker_transport_options={
+        'socket_keepalive': True,
+        'socket_timeout': 30,
+        'max_connections': 20,
+    },
+    result_backend_transport_options={'max_connections': 20},
+    # CPU-bound tasks: hand out one task at a time (-Ofair scheduling at the
+    # process level), ack after completion so a killed worker's job is
+    # redelivered, and recycle children periodically to cap gmpy2/GMP
+    # allocator growth across many big-int jobs
+    worker_prefetch_multiplier=1,
+    task_acks_late=True,
+    worker_max_tasks_per_child=50,
 )
 
+class LogBuffer:
+    """
+    Accumulates JobLog rows and writes them with one bulk INSERT + commit.
+
+    The factorization task logs liberally (progress ticks, stage banners,
+    diagnostics); committing each row individually makes fast stages
+    round-trip-bound. One buffer is active per task; flush points sit at
+    stage boundaries, cancellation checks, factor recording, and task exit,
+    so commits scale with stages rather than with log volume.
+    """
+
+    def __init__(self, db, job_id: str):
+        self.db = db
+        self.job_id = job_id
+        self.rows = []
+
+    # Safety valve: flush even between checkpoints once this many rows pile
+    # up, so log-heavy stages (CADO-NFS line streaming) stay bounded
+    MAX_BUFFERED = 500
+
+    def append(self, row: dict):
+        self.rows.append(row)
+        if len(self.rows) >= self.MAX_BUFFERED:
+            self.flush()
+
+    def flush(self):
+        """Bulk-insert buffered rows and commit (also commits pending job updates)"""
+        if self.rows:
+            # Core insert with a list of dicts takes the executemany path and
+            # skips ORM unit-of-work bookkeeping entirely
+            self.db.execute(insert(JobLog.__table__), self.rows)
+            self.rows.clear()
+        self.db.commit()
+
+
+# Buffer for the task currently running in this (prefork, single-task)
+# worker process; None outside a task, restoring per-call commits
+_log_buffer = None
+
+
+def _flush_logs(db):
+    """Flush the active log buffer, or just commit when none is active"""
+    if _log_buffer is not None:
+        _log_buffer.flush()
+    else:
+        db.commit()
+
+
+def _is_cancelled(db, job_id: str) -> bool:
+    """
+    Cancellation check via a scalar status SELECT.
+
+    db.refresh(job) reloads every column — n alone can be kilobytes — when
+    the poll only needs the enum. This also leaves the in-memory job's
+    attributes (pending progress values) untouched.
+    """
+    status = db.execute(select(Job.status).where(Job.id == job_id)).scalar()
+    return status == JobStatus.CANCELLED
+
+
+# Content-addressed factor cache: identical n submitted twice should not
+# re-run hours of pipeline. Keyed on a hash of the decimal string; entries
+# carry everything needed to replay JobResult rows for the new job.
+RESULT_CACHE_TTL = 30 * 86400
+_cache_redis = None
+
+
+def _factor_cache_key(n_str: str) -> str:
+    return "factors:" + hashlib.sha256(n_str.encode()).hexdigest()
+
+
+def _get_cached_factors(n_str: str):
+    """Fetch cached factors for n, or None (best-effort)"""
+    global _cache_redis
+    try:
+        if _cache_redis is None:
+            _cache_redis = redis.from_url(REDIS_URL)
+        cached = _cache_redis.get(_factor_cache_key(n_str))
+        return json.loads(cached) if cached else None
+    except Exception:
+        _cache_redis = None
+        return None
+
+
+def _set_cached_factors(n_str: str, entries):
+    """Record n's factors for future submissions (best-effort)"""
+    global _cache_redis
+    try:
+        if _cache_redis is None:
+            _cache_redis = redis.from_url(REDIS_URL)
+        _cache_redis.set(
+            _factor_cache_key(n_str), json.dumps(entries), ex=RESULT_CACHE_TTL
+        )
+    except Exception:
+        _cache_redis = None
+
+
+def _save_search_checkpoint(job_id: str, candidate, count: int):
+    """Persist equation-search position so a resubmit resumes here (best-effort)"""
+    global _cache_redis
+    try:
+        if _cache_redis is None:
+            _cache_redis = redis.from_url(REDIS_URL)
+        _cache_redis.hset(f"job:{job_id}:ckpt",
+                          mapping={"p": str(candidate), "count": count})
+    except Exception:
+        _cache_redis = None
+
+
+def _load_search_checkpoint(job_id: str):
+    """Return (last candidate, candidates checked) or None (best-effort)"""
+    global _cache_redis
+    try:
+        if _cache_redis is None:
+            _cache_redis = redis.from_url(REDIS_URL)
+        ckpt = _cache_redis.hgetall(f"job:{job_id}:ckpt")
+        if ckpt:
+            return int(ckpt[b"p"]), int(ckpt[b"count"])
+    except Exception:
+        _cache_redis = None
+    return None
+
+
+def _set_search_stop_flag(token: str):
+    """Tell in-flight equation-search slices to exit early (best-effort)"""
+    global _cache_redis
+    try:
+        if _cache_redis is None:
+            _cache_redis = redis.from_url(REDIS_URL)
+        _cache_redis.set(f"eqsearch:{token}:stop", 1, ex=3600)
+    except Exception:
+        _cache_redis = None
+
+
+def _search_stop_flag_set(token: str) -> bool:
+    """Check the slice stop flag; treats Redis trouble as not-stopped (best-effort)"""
+    global _cache_redis
+    try:
+        if _cache_redis is None:
+            _cache_redis = redis.from_url(REDIS_URL)
+        return bool(_cache_redis.exists(f"eqsearch:{token}:stop"))
+    except Exception:
+        _cache_redis = None
+        return False
+
+
+def _clear_search_checkpoint(job_id: str):
+    """Drop the search checkpoint once it can no longer help (best-effort)"""
+    global _cache_redis
+    try:
+        if _cache_redis is None:
+            _cache_redis = redis.from_url(REDIS_URL)
+        _cache_redis.delete(f"job:{job_id}:ckpt")
+    except Exception:
+        _cache_redis = None
+
+
+# Heartbeat keys let /api/health count live workers with one Redis scan
+# instead of a blocking celery inspect() broadcast
+HEARTBEAT_INTERVAL = 10
+HEARTBEAT_TTL = 30
+
+
+def _heartbeat_loop():
+    """Refresh this worker's liveness key in Redis every HEARTBEAT_INTERVAL seconds"""
+    key = f"worker:{socket.gethostname()}:alive"
+    client = None
+    while True:
+        try:
+            if client is None:
+                client = redis.from_url(REDIS_URL)
+            client.set(key, str(time.time()), ex=HEARTBEAT_TTL)
+        except Exception:
+            client = None
+        time.sleep(HEARTBEAT_INTERVAL)
+
+
+@worker_ready.connect
+def _start_heartbeat(**kwargs):
+    """Start the liveness heartbeat once the worker is ready"""
+    threading.Thread(target=_heartbeat_loop, daemon=True).start()
+
+
+# Concurrent Pollard-rho attempts per job; distinct random walks make the
+# fan-out close to linearly productive up to the worker's core count
+POLLARD_RHO_ATTEMPTS = 4
+
+
+@celery_app.task(name="pollard_rho_attempt")
+def pollard_rho_attempt(n_str: str, seed: int, max_iterations: int):
+    """One seeded Pollard-rho walk; returns the factor as a string or None"""
+    import random
+    from app.algos import pollard_rho
+    random.seed(seed)
+    factor = pollard_rho(int(n_str), max_iterations=max_iterations)
+    return str(factor) if factor else None
+
+
+def _run_pollard_rho_parallel(n: int, max_iterations: int):
+    """
+    Fan Pollard-rho attempts out across worker processes.
+
+    Each attempt runs an independently seeded walk (distinct start and
+    polynomial constant), so K attempts of max_iterations/K each cover the
+    same iteration budget in ~1/K the wall time. Falls back to the
+    in-process walk if dispatch or collection fails.
+    """
+    from celery import group
+    from app.algos import pollard_rho
+
+    per_attempt = max(1, max_iterations // POLLARD_RHO_ATTEMPTS)
+    try:
+        # Publish the whole group over one warmed broker channel; per-call
+        # acquisition would open and tear down a connection per attempt
+        with celery_app.producer_pool.acquire(block=True) as producer:
+            async_result = group(
+                pollard_rho_attempt.s(str(n), seed, per_attempt)
+                for seed in range(POLLARD_RHO_ATTEMPTS)
+            ).apply_async(producer=producer)
+        results = async_result.get(
+            timeout=600, propagate=False, disable_sync_subtasks=False
+        )
+    except Exception:
+        return pollard_rho(n, max_iterations=max_iterations)
+
+    # propagate=False surfaces failed attempts as Exception instances in
+    # the result list; skim any real factor first, then fall back to the
+    # in-process walk if a failure left the iteration budget uncovered
+    failed = False
+    for r in results:
+        if isinstance(r, Exception):
+            failed = True
+        elif r:
+            return int(r)
+    if failed:
+        return pollard_rho(n, max_iterations=max_iterations)
+    return None
+
+
+def _product_tree(values):
+    """
+    Balanced product of a sequence of machine-word primes as an mpz.
+
+    Sequential accumulation multiplies an ever-growing product by one small
+    operand at a time — O(k^2) limb work for a k-prime block. Pairing
+    similar-sized partial products instead keeps every multiply balanced,
+    which is the shape GMP's faster multiplication algorithms want.
+    """
+    # gmpy2 converts numpy scalars via __index__ directly; the explicit
+    # int() round trip added a second boxed integer per prime
+    items = [gmpy2.mpz(v) for v in values]
+    if not items:
+        return gmpy2.mpz(1)
+    while len(items) > 1:
+        paired = [items[i] * items[i + 1] for i in range(0, len(items) - 1, 2)]
+        if len(items) % 2:
+            paired.append(items[-1])
+        items = paired
+    return items[0]
+
+
+def _find_divisor_in_block(n_mpz, primes):
+    """
+    Locate a prime divisor inside a block whose product shares a factor
+    with n.
+
+    Binary descent with gcds on sub-products: ~log2(k) gcd calls on
+    shrinking operands instead of up to k full-width reductions of n.
+    Hit blocks occur at most once per search, so recomputing the
+    sub-products is cheaper than caching the whole tree.
+    """
+    if len(primes) == 1:
+        p = int(primes[0])
+        return p if n_mpz % p == 0 else None
+    mid = len(primes) // 2
+    left = primes[:mid]
+    if gmpy2.gcd(n_mpz, _product_tree(left)) != 1:
+        return _find_divisor_in_block(n_mpz, left)
+    return _find_divisor_in_block(n_mpz, primes[mid:])
+
+
+def _diag_value(v):
+    """JSON-safe rendering of one diagnostic value.
+
+    Wide integers are emitted as hex: converting an mpz to hex is linear in
+    limbs while decimal stringification is O(d^2), which matters when the
+    diagnostics carry several hundred-digit values.
+    """
+    if isinstance(v, (bool, float)):
+        return v
+    if isinstance(v, (int, gmpy2.mpz)):
+        return f"0x{int(v):x}" if v.bit_length() > 256 else int(v)
+    return str(v)
+
+
+# Disjoint range slices per equation-search fan-out; segment splitting
+# beats multiplier-style interleaving here because each slice stays
+# contiguous for primesieve's segmented iteration
+EQUATION_SEARCH_SEGMENTS = 4
+
+
+@celery_app.task(name="equation_search_segment")
+def equation_search_segment(n_str: str, lo: str, hi: str, stop_token: str = None):
+    """
+    Scan one [lo, hi] slice for a prime divisor of n.
+
+    Same gcd-batched segmented scan as the in-task stage-7 path, minus the
+    DB and progress bookkeeping; bounds travel as strings because they can
+    exceed JSON-safe integers. Returns the factor as a string, or None if
+    the slice is clean or the coordinator raised the stop flag (revoke()
+    only reaches still-queued tasks, so a running slice must check for
+    itself between segments).
+    """
+    from primesieve.numpy import primes as primes_numpy
+    import numpy as np
+
+    n_mpz = gmpy2.mpz(n_str)
+    lo_i = int(lo)
+    hi_i = int(hi)
+    n_word = np.uint64(int(n_mpz)) if n_mpz.bit_length() <= 63 else None
+    BLOCK = 1024
+    SEGMENT = 10_000_000
+
+    seg_lo = lo_i
+    while seg_lo <= hi_i:
+        if stop_token is not None and _search_stop_flag_set(stop_token):
+            return None
+        seg_hi = min(seg_lo + SEGMENT - 1, hi_i)
+        segment_primes = primes_numpy(seg_lo, seg_hi)
+        seg_lo = seg_hi + 1
+
+        if n_word is not None:
+            if len(segment_primes):
+                hits = np.flatnonzero(n_word % segment_primes == 0)
+                if hits.size:
+                    return str(int(segment_primes[hits[0]]))
+            continue
+
+        for i in range(0, len(segment_primes), BLOCK):
+            batch = segment_primes[i:i + BLOCK]
+            if gmpy2.gcd(n_mpz, _product_tree(batch)) != 1:
+                factor = _find_divisor_in_block(n_mpz, batch)
+                if factor is not None:
+                    return str(factor)
+    return None
+
+
+def _run_equation_search_parallel(n_str: str, lower: int, bound: int,
+                                  should_stop=None):
+    """
+    Fan the [lower, bound] scan out as disjoint slices across workers.
+
+    First hit wins and the rest of the group is torn down, mirroring the
+    ECM fan-out: revoke() drops the still-queued slices and the stop flag
+    (polled by each slice between segments) reaches the ones already
+    running. Returns the factor, or None when every slice completes clean
+    (or should_stop asks for teardown). Raises if dispatch or any slice
+    fails so the caller can fall back to the in-process scan.
+    """
+    from celery import group
+
+    step = (bound - lower) // EQUATION_SEARCH_SEGMENTS + 1
+    slices = []
+    s0 = lower
+    while s0 <= bound:
+        s1 = min(s0 + step - 1, bound)
+        slices.append((str(s0), str(s1)))
+        s0 = s1 + 1
+
+    stop_token = uuid.uuid4().hex
+    with celery_app.producer_pool.acquire(block=True) as producer:
+        async_result = group(
+            equation_search_segment.s(n_str, lo, hi, stop_token)
+            for lo, hi in slices
+        ).apply_async(producer=producer)
+
+    def _tear_down():
+        _set_search_stop_flag(stop_token)
+        async_result.revoke()
+
+    # Range scans have no natural deadline, but the coordinator must not
+    # wait forever either: with prefetch 1, enough concurrent coordinators
+    # can starve the slices of workers entirely. A no-progress watchdog
+    # (no slice finishing for 600s, matching the rho/ECM budgets) tears
+    # the group down and raises so the caller's in-process scan takes over.
+    completed = 0
+    last_progress = time.monotonic()
+    while True:
+        if should_stop is not None and should_stop():
+            _tear_down()
+            return None
+        done = True
+        now_completed = 0
+        for child in async_result.results:
+            if child.successful():
+                if child.result:
+                    _tear_down()
+                    return int(child.result)
+                now_completed += 1
+            elif child.failed():
+                _tear_down()
+                raise RuntimeError("equation search slice failed")
+            else:
+                done = False
+        if done:
+            return None
+        if now_completed > completed:
+            completed = now_completed
+            last_progress = time.monotonic()
+        elif time.monotonic() - last_progress > 600:
+            _tear_down()
+            raise RuntimeError("equation search fan-out made no progress in 600s")
+        time.sleep(0.5)
+
+
+# Product of the primes below 1000, built once at import. One gcd against
+# this rejects most composite cofactors for ~1000x less than a BPSW test.
+_SMALL_PRIME_PRODUCT = gmpy2.mpz(1)
+_p = gmpy2.mpz(2)
+while _p < 1000:
+    _SMALL_PRIME_PRODUCT *= _p
+    _p = gmpy2.next_prime(_p)
+del _p
+
+
+# Curves per fan-out sub-task; small enough to spread across cores, large
+# enough that the subprocess spawn isn't the dominant cost
+ECM_CURVE_BATCH_SIZE = 25
+
+
+@celery_app.task(name="ecm_curve_batch")
+def ecm_curve_batch(n_str: str, B1: int, curves: int):
+    """Run one batch of ECM curves; returns the factor as a string or None"""
+    from app.algos import ecm_factor
+    factor = ecm_factor(int(n_str), B1=B1, curves=curves)
+    return str(factor) if factor else None
+
+
+def _run_ecm_stages_parallel(n: int, stages, callback=None):
+    """
+    Run ECM stages with curves fanned out across worker processes.
+
+    ECM is embarrassingly parallel across curves, so each (B1, curves)
+    stage is split into ECM_CURVE_BATCH_SIZE-curve sub-tasks dispatched as
+    a Celery group. If dispatch or collection fails (no spare workers,
+    result backend trouble), the stage falls back to the in-process
+    sequential path so jobs never stall on the fan-out machinery.
+    """
+    from celery import group
+    from app.algos.ecm_wrapper import ecm_factor_staged
+
+    total = len(stages)
+    for stage_num, (B1, curves) in enumerate(stages):
+        if callback:
+            callback(stage_num, total, None)
+
+        batches = max(1, curves // ECM_CURVE_BATCH_SIZE)
+        per_batch = max(1, curves // batches)
+        try:
+            # One warmed broker channel for the whole batch of publishes
+            with celery_app.producer_pool.acquire(block=True) as producer:
+                async_result = group(
+                    ecm_curve_batch.s(str(n), B1, per_batch)
+                    for _ in range(batches)
+                ).apply_async(producer=producer)
+            # Waiting on subtasks from a task is normally discouraged; with
+            # prefetch 1 and batch runtimes bounded by ecm_factor's own
+            # 5-minute cap this is safe, and the except path covers stalls.
+            # Poll children instead of a blocking get so the first hit
+            # returns immediately and the rest of the group is revoked
+            # rather than burning cores on curves nobody needs.
+            factor = None
+            deadline = time.monotonic() + 600
+            while time.monotonic() < deadline:
+                for child in async_result.results:
+                    if child.successful() and child.result:
+                        factor = int(child.result)
+                        break
+                if factor is not None or async_result.ready():
+                    break
+                time.sleep(0.5)
+
+            if factor is not None:
+                async_result.revoke()
+                return factor
+            if not async_result.ready():
+                # Deadline expired with batches still out: revoke the
+                # stragglers so they stop burning worker slots, then run
+                # this stage sequentially instead of silently skipping it
+                async_result.revoke()
+                factor = ecm_factor_staged(n, stages=[(B1, curves)])
+                if factor:
+                    return factor
+        except Exception:
+            factor = ecm_factor_staged(n, stages=[(B1, curves)])
+            if factor:
+                return factor
+            continue
+
+    return None
+
 
 @celery_app.task(name="run_factorization")
 def run_factorization_task(job_id: str):
@@ -43,7 +647,6 @@ def run_factorization_task(job_id: str):
     7. Trurl equation-guided search (if enabled)
     8. Report results
     """
-    from app.models import get_engine, get_session_factory, Job, JobLog, JobResult, JobStatus
     from app.algos import (
         is_prime_mr, is_prime_bpsw, is_prime_fast,
         pollard_rho, ecm_factor, trial_division_with_wheel, shor_classical_multi_attempt,
@@ -51,14 +654,59 @@ def run_factorization_task(job_id: str):
         generate_certificate_simple
     )
     from app.equations import SemiPrimeEquationSolver
-    from primesieve import Iterator
+    from primesieve.numpy import primes as primes_numpy
     import gmpy2
+    import numpy as np
+
+    # Session from the process-wide engine (built once at worker_process_init)
+    db = _get_session()
+
+    global _log_buffer
+    _log_buffer = LogBuffer(db, job_id)
+
+    # Cancellation rides Redis pub/sub: a listener thread blocks on
+    # job:{id}:control and flips an Event the moment the API publishes a
+    # cancel, so the hot loops pay a flag check per interval instead of a
+    # socket drain plus a status SELECT. The DB poll survives as a
+    # rate-limited backup (at most every 5s) in case the message is lost.
+    # The GMP inner loops are many short calls, not one long GIL-holding
+    # operation, so the interpreter schedules this thread (and the
+    # heartbeat) without needing a nogil extension.
+    control_pubsub = None
+    cancel_event = threading.Event()
+    try:
+        _control_conn = redis.from_url(REDIS_URL)
+        control_pubsub = _control_conn.pubsub()
+        control_pubsub.subscribe(f"job:{job_id}:control")
 
-    # Get database session
-    DATABASE_URL = os.getenv("DATABASE_URL", "postgresql://factor:factor_dev_password@db:5432/factordb")
-    engine = get_engine(DATABASE_URL)
-    SessionFactory = get_session_factory(engine)
-    db = SessionFactory()
+        def _control_listener():
+            while not cancel_event.is_set():
+                try:
+                    msg = control_pubsub.get_message(
+                        ignore_subscribe_messages=True, timeout=1.0
+                    )
+                except Exception:
+                    # Pubsub closed at task exit (or connection lost);
+                    # the DB backup still covers cancellation
+                    return
+                if msg is not None and msg.get("data") in (b"cancel", "cancel"):
+                    cancel_event.set()
+                    return
+
+        threading.Thread(target=_control_listener, daemon=True).start()
+    except Exception:
+        control_pubsub = None
+
+    _next_db_poll = [0.0]
+
+    def cancellation_requested() -> bool:
+        if cancel_event.is_set():
+            return True
+        now = time.monotonic()
+        if now < _next_db_poll[0]:
+            return False
+        _next_db_poll[0] = now + 5.0
+        return _is_cancelled(db, job_id)
 
     try:
         # Load job
@@ -75,11 +723,54 @@ def run_factorization_task(job_id: str):
         job.started_at = datetime.utcnow()
         db.commit()
 
-        # Parse input
-        n = int(job.n)
-        add_log(db, job_id, "INFO", f"Starting factorization of {len(str(n))}-digit number", "initialization")
+        # Parse input. job.n is already the decimal string, so reuse it for
+        # digit counts instead of re-deriving str(n), which is O(d^2) for
+        # bignums.
+        # Jobs created since the n_bytes/n_digits columns landed skip the
+        # O(d^2) decimal parse; older rows fall back to the text column
+        if job.n_bytes is not None:
+            n = int.from_bytes(job.n_bytes, "little")
+        else:
+            n = int(job.n)
+        n_mpz = gmpy2.mpz(n)
+        n_digits = job.n_digits if job.n_digits is not None else len(job.n)
+        add_log(db, job_id, "INFO", f"Starting factorization of {n_digits}-digit number", "initialization")
+
+        # Single monotonic origin for every elapsed measurement: immune to
+        # NTP step adjustments that can make wall-clock deltas negative,
+        # and one integer subtraction per reading
+        start_ns = time.monotonic_ns()
+
+        def _elapsed_ms() -> int:
+            return (time.monotonic_ns() - start_ns) // 1_000_000
+
+        # Short-circuit on a prior factorization of the same n: replay the
+        # cached factors as this job's results in one Redis round-trip
+        cached_entries = _get_cached_factors(job.n)
+        if cached_entries:
+            add_log(db, job_id, "INFO",
+                   f"Factors known from a previous job; returning {len(cached_entries)} cached factors",
+                   "initialization")
+            found_at = datetime.utcnow()
+            db.execute(insert(JobResult.__table__), [{
+                "job_id": job_id,
+                "factor": entry["factor"],
+                "is_prime": entry.get("is_prime", False),
+                "certificate": None,
+                "found_by_algorithm": entry.get("found_by_algorithm", "result_cache"),
+                "elapsed_ms": 0,
+                "found_at": found_at,
+            } for entry in cached_entries])
 
-        start_time = time.time()
+            job.status = JobStatus.COMPLETED
+            job.factors_found = [entry["factor"] for entry in cached_entries]
+            job.finished_at = found_at
+            job.total_time_seconds = 0
+            job.progress_percent = 100
+            _flush_logs(db)
+            return {"status": "completed",
+                    "factors": [entry["factor"] for entry in cached_entries],
+                    "cached": True}
 
         # Parse algorithm policy to determine primality test
         policy = job.algorithm_policy or {}
@@ -91,7 +782,27 @@ def run_factorization_task(job_id: str):
                f"Checking if number is prime using {'BPSW' if use_bpsw else 'Miller-Rabin'}...",
                "primality_check")
 
-        primality_test = is_prime_fast if use_bpsw else is_prime_mr
+        # Stage code tests each cofactor's primality, then record_factor
+        # tests the same value again; memoize per task so every candidate
+        # pays for BPSW/Miller-Rabin once. String keys keep int/mpz aliases
+        # of the same value from splitting cache entries.
+        base_primality_test = is_prime_fast if use_bpsw else is_prime_mr
+
+        @lru_cache(maxsize=1024)
+        def _is_prime_cached(m_str: str) -> bool:
+            m = int(m_str)
+            # Most composite cofactors have a divisor below 1000; one gcd
+            # against the precomputed small-prime product rules them out
+            # without paying for BPSW. Values small enough to themselves
+            # share a factor with the product while being prime (m < 10^6)
+            # skip the shortcut.
+            if m >= 1_000_000 and gmpy2.gcd(m, _SMALL_PRIME_PRODUCT) != 1:
+                return False
+            return base_primality_test(m)
+
+        def primality_test(m) -> bool:
+            return _is_prime_cached(str(m))
+
         if primality_test(n):
             add_log(db, job_id, "INFO", "Number is prime (no factorization possible)", "primality_check")
 
@@ -103,7 +814,7 @@ def run_factorization_task(job_id: str):
                         add_log(db, job_id, "INFO",
                                f"Generated primality certificate with {len(cert.steps)} steps",
                                "primality_check",
-                               payload={"certificate": cert.to_json()})
+                               payload={"certificate": cert.to_dict()})
                 except Exception as e:
                     add_log(db, job_id, "WARNING",
                            f"Failed to generate certificate: {e}",
@@ -111,9 +822,9 @@ def run_factorization_task(job_id: str):
 
             job.status = JobStatus.COMPLETED
             job.finished_at = datetime.utcnow()
-            job.total_time_seconds = int(time.time() - start_time)
+            job.total_time_seconds = _elapsed_ms() // 1000
             job.progress_percent = 100
-            db.commit()
+            _flush_logs(db)
             return {"status": "prime", "n": str(n)}
 
         # Initialize Trurl equation solver if enabled
@@ -127,8 +838,8 @@ def run_factorization_task(job_id: str):
             add_log(db, job_id, "INFO",
                    f"Semiprime analysis: {diagnostic['pnp_digits']} digits, sqrt has {diagnostic['sqrt_pnp_digits']} digits",
                    "equation",
-                   payload={"diagnostics": {k: str(v) if not isinstance(v, (int, float, bool)) else v
-                                           for k, v in diagnostic.items() if k not in ['pnp', 'sqrt_pnp']}})
+                   payload={"diagnostics": {k: _diag_value(v)
+                                           for k, v in diagnostic.items() if k not in ('pnp', 'sqrt_pnp')}})
 
             # Compute bounds using Trurl's method
             lower, upper = solver.find_initial_bounds()
@@ -136,12 +847,13 @@ def run_factorization_task(job_id: str):
                 job.lower_bound = str(lower)
             if not job.upper_bound:
                 job.upper_bound = str(upper)
-            db.commit()
+            _flush_logs(db)
 
-            # Log bounds with scientific notation
-            import math
-            lower_exp = math.log10(lower) if lower > 0 else 0
-            upper_exp = math.log10(upper) if upper > 0 else 0
+            # Log bounds with scientific notation; bit_length-based log10
+            # handles bounds past the ~10^308 float conversion limit without
+            # a bignum-to-float pass
+            lower_exp = lower.bit_length() * 0.30102999566398114 if lower > 0 else 0
+            upper_exp = upper.bit_length() * 0.30102999566398114 if upper > 0 else 0
             add_log(db, job_id, "INFO",
                    f"Trurl bounds: lower = 10^{lower_exp:.1f}, upper = 10^{upper_exp:.1f}",
                    "equation")
@@ -190,51 +902,35 @@ def run_factorization_task(job_id: str):
         if use_trial_division:
             add_log(db, job_id, "INFO", f"Stage 1: Trial division up to {trial_limit:,}", "trial_division")
             job.progress_percent = 5
-            db.commit()
+            _flush_logs(db)
 
             factor = trial_division_with_wheel(n, limit=trial_limit)
             if factor:
-                elapsed_ms = int((time.time() - start_time) * 1000)
+                elapsed_ms = _elapsed_ms()
                 add_log(db, job_id, "INFO", f"Found factor via trial division: {factor}", "trial_division")
-                record_factor(db, job_id, factor, "trial_division", elapsed_ms,
-                            primality_test, generate_certs)
-                found_factors.append(factor)
-
-                cofactor = n // factor
-                if cofactor > 1 and cofactor != factor:
-                    if primality_test(cofactor):
-                        add_log(db, job_id, "INFO", f"Cofactor {cofactor} is prime", "trial_division")
-                        record_factor(db, job_id, cofactor, "trial_division", elapsed_ms,
-                                    primality_test, generate_certs)
-                        found_factors.append(cofactor)
+                found_factors.extend(record_factor_pair(
+                    db, job_id, factor, int(n_mpz // factor), "trial_division", elapsed_ms,
+                    primality_test, generate_certs))
 
         # Stage 2: Pollard-rho (cheap probabilistic method)
         if not found_factors and use_pollard_rho:
             add_log(db, job_id, "INFO", f"Stage 2: Pollard-rho ({pollard_iterations:,} iterations)", "pollard_rho")
             job.progress_percent = 15
-            db.commit()
+            _flush_logs(db)
 
-            factor = pollard_rho(n, max_iterations=pollard_iterations)
+            factor = _run_pollard_rho_parallel(n, pollard_iterations)
             if factor:
-                elapsed_ms = int((time.time() - start_time) * 1000)
+                elapsed_ms = _elapsed_ms()
                 add_log(db, job_id, "INFO", f"Found factor via Pollard-rho: {factor}", "pollard_rho")
-                record_factor(db, job_id, factor, "pollard_rho", elapsed_ms,
-                            primality_test, generate_certs)
-                found_factors.append(factor)
-
-                cofactor = n // factor
-                if cofactor > 1 and cofactor != factor:
-                    if primality_test(cofactor):
-                        add_log(db, job_id, "INFO", f"Cofactor {cofactor} is prime", "pollard_rho")
-                        record_factor(db, job_id, cofactor, "pollard_rho", elapsed_ms,
-                                    primality_test, generate_certs)
-                        found_factors.append(cofactor)
+                found_factors.extend(record_factor_pair(
+                    db, job_id, factor, int(n_mpz // factor), "pollard_rho", elapsed_ms,
+                    primality_test, generate_certs))
 
         # Stage 3: Shor's Algorithm (Classical Emulation)
         if not found_factors and policy.get("use_shor_classical", True):
             add_log(db, job_id, "INFO", "Stage 3: Shor's algorithm (classical emulation)", "shor_classical")
             job.progress_percent = 25
-            db.commit()
+            _flush_logs(db)
 
             # Educational note about this stage
             add_log(db, job_id, "INFO",
@@ -247,8 +943,7 @@ def run_factorization_task(job_id: str):
 
             for i, B in enumerate(B_values):
                 # Check for cancellation
-                db.refresh(job)
-                if job.status == JobStatus.CANCELLED:
+                if cancellation_requested():
                     add_log(db, job_id, "INFO", "Job cancelled by user", "shor_classical")
                     return {"status": "cancelled"}
 
@@ -263,7 +958,7 @@ def run_factorization_task(job_id: str):
                 )
 
                 if factor:
-                    elapsed_ms = int((time.time() - start_time) * 1000)
+                    elapsed_ms = _elapsed_ms()
 
                     # Log the successful attempt's details
                     successful_diag = [d for d in all_diagnostics if 'method' in d and 'failed' not in d.get('method', '')]
@@ -288,22 +983,14 @@ def run_factorization_task(job_id: str):
                             add_log(db, job_id, "INFO", explanation, "shor_classical")
 
                     add_log(db, job_id, "INFO", f"Found factor via Shor classical: {factor}", "shor_classical")
-                    record_factor(db, job_id, factor, "shor_classical", elapsed_ms,
-                                primality_test, generate_certs)
-                    found_factors.append(factor)
-
-                    cofactor = n // factor
-                    if cofactor > 1 and cofactor != factor:
-                        if primality_test(cofactor):
-                            add_log(db, job_id, "INFO", f"Cofactor {cofactor} is prime", "shor_classical")
-                            record_factor(db, job_id, cofactor, "shor_classical", elapsed_ms,
-                                        primality_test, generate_certs)
-                            found_factors.append(cofactor)
+                    found_factors.extend(record_factor_pair(
+                        db, job_id, factor, int(n_mpz // factor), "shor_classical", elapsed_ms,
+                        primality_test, generate_certs))
                     break
 
                 # Update progress
                 job.progress_percent = 25 + int((i + 1) / len(B_values) * 5)
-                db.commit()
+                _flush_logs(db)
 
             if not found_factors:
                 add_log(db, job_id, "INFO",
@@ -314,44 +1001,41 @@ def run_factorization_task(job_id: str):
         if not found_factors and use_ecm:
             add_log(db, job_id, "INFO", "Stage 4: Elliptic Curve Method (ECM)", "ecm")
             job.progress_percent = 30
-            db.commit()
+            _flush_logs(db)
 
             # Parse ECM parameters
             ecm_params = job.ecm_params or {}
             stages = ecm_params.get("stages", [(10000, 25), (50000, 100), (250000, 200)])
 
             def ecm_callback(stage_num, total_stages, factor_found):
-                job.progress_percent = 30 + int((stage_num / total_stages) * 40)
+                # Buffered log + targeted Core UPDATE: one commit per stage
+                # boundary, no ORM unit-of-work pass over the hydrated job
                 add_log(db, job_id, "INFO",
                        f"ECM stage {stage_num+1}/{total_stages} (B1={stages[stage_num][0]}, curves={stages[stage_num][1]})",
                        "ecm")
-                db.commit()
+                db.execute(
+                    update(Job.__table__)
+                    .where(Job.__table__.c.id == job_id)
+                    .values(progress_percent=30 + int((stage_num / total_stages) * 40))
+                )
+                _flush_logs(db)
 
-            from app.algos.ecm_wrapper import ecm_factor_staged
-            factor = ecm_factor_staged(n, stages=stages, callback=ecm_callback)
+            factor = _run_ecm_stages_parallel(n, stages, callback=ecm_callback)
 
             if factor:
-                elapsed_ms = int((time.time() - start_time) * 1000)
+                elapsed_ms = _elapsed_ms()
                 add_log(db, job_id, "INFO", f"Found factor via ECM: {factor}", "ecm")
-                record_factor(db, job_id, factor, "ecm", elapsed_ms,
-                            primality_test, generate_certs)
-                found_factors.append(factor)
-
-                cofactor = n // factor
-                if cofactor > 1 and cofactor != factor:
-                    if primality_test(cofactor):
-                        add_log(db, job_id, "INFO", f"Cofactor {cofactor} is prime", "ecm")
-                        record_factor(db, job_id, cofactor, "ecm", elapsed_ms,
-                                    primality_test, generate_certs)
-                        found_factors.append(cofactor)
+                found_factors.extend(record_factor_pair(
+                    db, job_id, factor, int(n_mpz // factor), "ecm", elapsed_ms,
+                    primality_test, generate_certs))
 
         # Stage 5: Advanced ECM (for 30+ digit factors)
         if not found_factors and use_ecm:
-            digit_count = len(str(n))
+            digit_count = n_digits
             if digit_count >= 30:  # ECM is most effective for larger numbers
                 add_log(db, job_id, "INFO", "Stage 5: Advanced ECM (GMP-ECM)", "ecm_advanced")
                 job.progress_percent = 60
-                db.commit()
+                _flush_logs(db)
 
                 try:
                     from app.algos.ecm_advanced import ecm_factor_staged_advanced, suggest_ecm_params
@@ -365,29 +1049,24 @@ def run_factorization_task(job_id: str):
                            payload=params)
 
                     def ecm_advanced_callback(stage_num, total_stages, B1, curves):
-                        progress = 60 + int((stage_num / total_stages) * 15)
-                        job.progress_percent = progress
                         add_log(db, job_id, "INFO",
                                f"ECM advanced stage {stage_num+1}/{total_stages} (B1={B1:,}, curves={curves:,})",
                                "ecm_advanced")
-                        db.commit()
+                        db.execute(
+                            update(Job.__table__)
+                            .where(Job.__table__.c.id == job_id)
+                            .values(progress_percent=60 + int((stage_num / total_stages) * 15))
+                        )
+                        _flush_logs(db)
 
                     factor = ecm_factor_staged_advanced(n, digit_count, callback=ecm_advanced_callback)
 
                     if factor:
-                        elapsed_ms = int((time.time() - start_time) * 1000)
+                        elapsed_ms = _elapsed_ms()
                         add_log(db, job_id, "INFO", f"Found factor via Advanced ECM: {factor}", "ecm_advanced")
-                        record_factor(db, job_id, factor, "ecm_advanced", elapsed_ms,
-                                    primality_test, generate_certs)
-                        found_factors.append(factor)
-
-                        cofactor = n // factor
-                        if cofactor > 1 and cofactor != factor:
-                            if primality_test(cofactor):
-                                add_log(db, job_id, "INFO", f"Cofactor {cofactor} is prime", "ecm_advanced")
-                                record_factor(db, job_id, cofactor, "ecm_advanced", elapsed_ms,
-                                            primality_test, generate_certs)
-                                found_factors.append(cofactor)
+                        found_factors.extend(record_factor_pair(
+                            db, job_id, factor, int(n_mpz // factor), "ecm_advanced", elapsed_ms,
+                            primality_test, generate_certs))
                 except ImportError:
                     add_log(db, job_id, "WARNING",
                            "Advanced ECM (passagemath-libecm) not available. Skipping.",
@@ -395,12 +1074,12 @@ def run_factorization_task(job_id: str):
 
         # Stage 6: CADO-NFS (for 200+ digit semiprimes - production GNFS)
         if not found_factors:
-            digit_count = len(str(n))
+            digit_count = n_digits
             force_cado = policy.get("force_cado_nfs", False)
             if digit_count >= 200 or force_cado:  # CADO-NFS for large numbers or when forced
                 add_log(db, job_id, "INFO", f"Stage 6: CADO-NFS (General Number Field Sieve){'- FORCED' if force_cado else ''}", "cado_nfs")
                 job.progress_percent = 75
-                db.commit()
+                _flush_logs(db)
 
                 try:
                     from app.algos.cado_nfs import cado_nfs_factor, estimate_cado_runtime, HAS_CADO
@@ -418,25 +1097,50 @@ def run_factorization_task(job_id: str):
                         # Get expected factor size from Trurl bounds (if available)
                         expected_factor_digits = None
                         if solver and job.lower_bound:
-                            import math
                             try:
                                 lower = int(float(job.lower_bound))
-                                expected_factor_digits = int(math.log10(lower))
+                                expected_factor_digits = int(lower.bit_length() * 0.30102999566398114)
                                 add_log(db, job_id, "INFO",
                                        f"Using Trurl hint for polynomial selection: expected factor ~10^{expected_factor_digits}",
                                        "cado_nfs")
                             except:
                                 pass
 
-                        # Setup CADO callback for progress updates
-                        def cado_callback(log_line):
-                            # Stream CADO-NFS logs to database
-                            add_log(db, job_id, "INFO", log_line, "cado_nfs")
+                        # Setup CADO callback for progress updates. CADO can
+                        # stream log lines for weeks; raw lines go to a capped
+                        # Redis stream (and the live event channel) rather
+                        # than one JobLog row each, with a summary row every
+                        # minute. Cancellation is probed at most once per
+                        # second instead of once per line.
+                        last_checkpoint = time.monotonic()
+                        last_summary = last_checkpoint
+                        cado_line_count = 0
 
-                            # Check for cancellation periodically
-                            db.refresh(job)
-                            if job.status == JobStatus.CANCELLED:
-                                raise Exception("Job cancelled by user")
+                        def cado_callback(log_line):
+                            nonlocal last_checkpoint, last_summary, cado_line_count
+                            cado_line_count += 1
+                            _stream_raw_log(job_id, log_line)
+                            _publish_job_event(job_id, {
+                                "type": "log",
+                                "timestamp": datetime.utcnow().isoformat(),
+                                "level": "INFO",
+                                "message": log_line,
+                                "stage": "cado_nfs",
+                                "payload": None
+                            })
+
+                            now = time.monotonic()
+                            if now - last_summary >= 60.0:
+                                last_summary = now
+                                add_log(db, job_id, "INFO",
+                                       f"CADO-NFS running ({cado_line_count} output lines so far; "
+                                       f"full output in Redis stream job:{job_id}:log)",
+                                       "cado_nfs")
+                            if now - last_checkpoint >= 1.0:
+                                last_checkpoint = now
+                                _flush_logs(db)
+                                if cancellation_requested():
+                                    raise Exception("Job cancelled by user")
 
                         # Run CADO-NFS (this may take weeks/months for RSA-260)
                         add_log(db, job_id, "INFO",
@@ -454,7 +1158,7 @@ def run_factorization_task(job_id: str):
 
                         if result:
                             p, q = result
-                            elapsed_ms = int((time.time() - start_time) * 1000)
+                            elapsed_ms = _elapsed_ms()
                             add_log(db, job_id, "INFO", f"CADO-NFS found factors: {p} × {q}", "cado_nfs")
 
                             # Record both factors
@@ -473,6 +1177,14 @@ def run_factorization_task(job_id: str):
                         add_log(db, job_id, "INFO", "CADO-NFS cancelled by user", "cado_nfs")
                         return {"status": "cancelled"}
                     else:
+                        # A statement that failed mid-stage leaves the session
+                        # in a rolled-back-required state; recover it here so
+                        # the continue-on-error path and later stages can keep
+                        # writing. Buffered logs live in Python and survive.
+                        try:
+                            db.rollback()
+                        except Exception:
+                            pass
                         add_log(db, job_id, "WARNING",
                                f"CADO-NFS error: {e}. Continuing with other methods...",
                                "cado_nfs")
@@ -481,12 +1193,24 @@ def run_factorization_task(job_id: str):
         if not found_factors and solver and job.lower_bound and job.upper_bound:
             add_log(db, job_id, "INFO", "Stage 6: Equation-guided prime search (Trurl method)", "equation_search")
             job.progress_percent = 75
-            db.commit()
+            _flush_logs(db)
 
             # Convert from scientific notation if needed (e.g., "1e90" -> 10^90)
             lower = int(float(job.lower_bound))
             upper = int(float(job.upper_bound))
 
+            # Resume from the last checkpoint (written every progress
+            # interval below) so cancel + resubmit loses at most one
+            # interval of work instead of the whole scan
+            count_base = 0
+            ckpt = _load_search_checkpoint(job_id)
+            if ckpt is not None and lower < ckpt[0] <= upper:
+                lower, count_base = ckpt
+                add_log(db, job_id, "INFO",
+                       f"Resuming equation search from checkpoint at {lower} "
+                       f"({count_base:,} candidates already checked)",
+                       "equation_search")
+
             # Determine which prime iterator to use
             MAX_PRIMESIEVE = 2**64 - 1
             use_arbitrary_precision = lower > MAX_PRIMESIEVE or upper > MAX_PRIMESIEVE
@@ -502,169 +1226,298 @@ def run_factorization_task(job_id: str):
                        f"Consider using CADO-NFS for numbers this large.",
                        "equation_search")
 
-                # Use gmpy2.next_prime for arbitrary precision
-                prime = gmpy2.next_prime(gmpy2.mpz(lower))
-                count = 0
-                check_interval = 1000  # Check less frequently for large numbers
-
-                while prime <= upper and prime <= gmpy2.isqrt(gmpy2.mpz(n)):
-                    # Check for cancellation
-                    db.refresh(job)
-                    if job.status == JobStatus.CANCELLED:
-                        add_log(db, job_id, "INFO", "Job cancelled by user", "equation_search")
-                        return {"status": "cancelled"}
-
-                    # Test if prime divides n
-                    if n % int(prime) == 0:
-                        elapsed_ms = int((time.time() - start_time) * 1000)
-                        add_log(db, job_id, "INFO", f"Found factor via Trurl equation search: {prime}", "equation_search")
-
-                        prime_int = int(prime)
-                        cofactor = n // prime_int
-
-                        # Verify all Trurl constraints
-                        x_factor = min(prime_int, cofactor)
-                        y_factor = max(prime_int, cofactor)
-                        constraints = solver.verify_all_constraints(x_factor, y_factor)
-
-                        # Log constraint verification
-                        all_satisfied = all(v for v in constraints.values() if v is not None)
-                        if all_satisfied:
+                # Segmented offset sieve: gmpy2.next_prime runs a BPSW
+                # test per candidate, which dominated this loop. Instead,
+                # strike multiples of small primes across a window of odd
+                # offsets above the current base, then trial-divide only the
+                # survivors (~1 in 10 odds near 10^100 survive sieving to
+                # 10^5). Survivors need no primality test at all: n is a
+                # semiprime, so any divisor found below sqrt(n) is its
+                # smaller prime factor, and composite survivors simply cost
+                # one wasted mpz reduction each.
+                SIEVE_LIMIT = 100_000
+                SEGMENT = 65_536  # odd offsets per window
+                small_primes = [int(sp) for sp in primes_numpy(3, SIEVE_LIMIT)]
+
+                count = count_base
+                check_interval = 50_000  # candidates between progress checks
+                next_check = count + check_interval
+
+                # isqrt of a hundreds-of-digit n is a Newton iteration in its
+                # own right; evaluate it once and fold both limits into a
+                # single bound compared per iteration
+                bound = min(gmpy2.mpz(upper), gmpy2.isqrt(n_mpz))
+
+                base = gmpy2.mpz(lower) | 1  # first odd candidate
+                factor_prime = None
+
+                while base <= bound and factor_prime is None:
+                    # Candidates in this window are base + 2i; the first
+                    # offset hit by odd prime p solves base + 2i = 0 (mod p),
+                    # i.e. i = -base * inverse(2) (mod p)
+                    sieve = bytearray(SEGMENT)
+                    one = b"\x01"
+                    for sp in small_primes:
+                        i0 = (int(-base % sp) * ((sp + 1) // 2)) % sp
+                        sieve[i0::sp] = one * len(range(i0, SEGMENT, sp))
+
+                    for i in range(SEGMENT):
+                        if sieve[i]:
+                            continue
+                        candidate = base + 2 * i
+                        if candidate > bound:
+                            break
+
+                        count += 1
+                        if count >= next_check:
+                            next_check = count + check_interval
+                            # Poll for cancellation once per interval — a
+                            # refresh per candidate made the loop DB-bound,
+                            # not CPU-bound
+                            if cancellation_requested():
+                                add_log(db, job_id, "INFO", "Job cancelled by user", "equation_search")
+                                return {"status": "cancelled"}
+
+                            # Update progress
+                            progress = solver.estimate_progress(int(candidate), lower, upper)
+                            job.progress_percent = int(75 + (progress * 0.20))
+                            job.current_candidate = str(candidate)
                             add_log(db, job_id, "INFO",
-                                   "All Trurl constraints verified: pnp=x*y, equation match, x<y, inverse relationship",
-                                   "equation_search",
-                                   payload={"constraints": constraints})
-                        else:
-                            add_log(db, job_id, "WARNING",
-                                   f"Some constraints not satisfied: {constraints}",
-                                   "equation_search",
-                                   payload={"constraints": constraints})
-
-                        # Compute y using Trurl's equation for verification
-                        computed_y = solver.compute_y_from_x(x_factor)
+                                   f"Checked {count:,} sieve-surviving candidates. Current: {int(candidate):,}",
+                                   "equation_search")
+                            _flush_logs(db)
+                            _save_search_checkpoint(job_id, int(candidate), count)
+
+                        # Keeping n in mpz form makes the reduction a single
+                        # GMP call with no PyLong round trip
+                        if n_mpz % candidate == 0:
+                            factor_prime = candidate
+                            break
+
+                    base += 2 * SEGMENT
+
+                if factor_prime is not None:
+                    prime = factor_prime
+                    elapsed_ms = _elapsed_ms()
+                    add_log(db, job_id, "INFO", f"Found factor via Trurl equation search: {prime}", "equation_search")
+
+                    prime_int = int(prime)
+                    cofactor = int(n_mpz // prime_int)
+
+                    # Verify all Trurl constraints
+                    x_factor = min(prime_int, cofactor)
+                    y_factor = max(prime_int, cofactor)
+                    constraints = solver.verify_all_constraints(x_factor, y_factor)
+
+                    # Log constraint verification
+                    all_satisfied = all(v for v in constraints.values() if v is not None)
+                    if all_satisfied:
                         add_log(db, job_id, "INFO",
-                               f"Trurl equation y = (((pnp^2/x) + x^2) / pnp) yields {computed_y} (actual y = {y_factor})",
-                               "equation_search")
-
-                        # Record factors
-                        record_factor(db, job_id, prime_int, "equation_search", elapsed_ms,
-                                    primality_test, generate_certs)
-                        found_factors.append(prime_int)
-
-                        if cofactor > 1:
-                            if primality_test(cofactor):
-                                add_log(db, job_id, "INFO", f"Cofactor {cofactor} is prime", "equation_search")
-                                record_factor(db, job_id, cofactor, "equation_search", elapsed_ms,
-                                            primality_test, generate_certs)
-                                found_factors.append(cofactor)
-                        break
+                               "All Trurl constraints verified: pnp=x*y, equation match, x<y, inverse relationship",
+                               "equation_search",
+                               payload={"constraints": constraints})
+                    else:
+                        add_log(db, job_id, "WARNING",
+                               f"Some constraints not satisfied: {constraints}",
+                               "equation_search",
+                               payload={"constraints": constraints})
 
-                    count += 1
-                    if count % check_interval == 0:
-                        # Update progress
-                        progress = solver.estimate_progress(int(prime), lower, upper)
-                        job.progress_percent = int(75 + (progress * 0.20))
-                        job.current_candidate = str(prime)
-                        add_log(db, job_id, "INFO",
-                               f"Checked {count:,} primes. Current: {int(prime):,}",
-                               "equation_search")
-                        db.commit()
+                    # Compute y using Trurl's equation for verification
+                    computed_y = solver.compute_y_from_x(x_factor)
+                    add_log(db, job_id, "INFO",
+                           f"Trurl equation y = (((pnp^2/x) + x^2) / pnp) yields {computed_y} (actual y = {y_factor})",
+                           "equation_search")
 
-                    prime = gmpy2.next_prime(prime)
+                    # Record factors
+                    found_factors.extend(record_factor_pair(
+                        db, job_id, prime_int, cofactor, "equation_search", elapsed_ms,
+                        primality_test, generate_certs))
 
             else:
                 # Use fast primesieve for numbers < 2^64
                 add_log(db, job_id, "INFO", f"Using primesieve for fast iteration in range [{lower:.2e}, {upper:.2e}]", "equation_search")
 
-                # Use primesieve to iterate primes efficiently
-                it = Iterator()
-                it.skipto(lower)
-
-                prime = it.next_prime()
-                count = 0
+                # Sieve primes in bulk: one C-level segmented-sieve call per
+                # value window instead of a Python next_prime() call (and a
+                # boxed int) per prime.
+                count = count_base
                 check_interval = 10000
-
-                while prime <= upper and prime <= int(gmpy2.isqrt(n)):
-                    # Check for cancellation
-                    db.refresh(job)
-                    if job.status == JobStatus.CANCELLED:
+                next_check = count + check_interval
+
+                # Batch trial division via product tree: multiply a block of
+                # primes into one mpz and take a single gcd against n. One
+                # quasilinear gcd on large operands replaces BLOCK separate
+                # O(len(n)) reductions; only a hit (gcd > 1) pays for the
+                # per-prime scan to identify which prime divides n. This is
+                # also why a JIT-specialized Barrett reducer for the fixed n
+                # buys nothing here: the per-prime reduction it would speed
+                # up no longer exists, and the remaining gcds already run in
+                # GMP's tuned assembly.
+                bound = min(upper, int(gmpy2.isqrt(n_mpz)))
+                BLOCK = 1024
+                SEGMENT = 10_000_000  # value range per sieve call
+
+                factor_prime = None
+                seg_lo = lower
+
+                # Wide ranges fan out across workers as disjoint slices
+                # (first hit wins); any dispatch or slice failure falls
+                # back to the in-process scan below. Checkpointing stays
+                # with the sequential path — slices restart cheaply.
+                if bound - lower >= EQUATION_SEARCH_SEGMENTS * SEGMENT:
+                    try:
+                        factor_prime = _run_equation_search_parallel(
+                            job.n, lower, bound,
+                            should_stop=cancellation_requested)
+                        seg_lo = bound + 1  # range covered; skip the scan
+                    except Exception:
+                        pass
+                    if factor_prime is None and cancellation_requested():
                         add_log(db, job_id, "INFO", "Job cancelled by user", "equation_search")
                         return {"status": "cancelled"}
 
-                    # Test if prime divides n
-                    if n % prime == 0:
-                        elapsed_ms = int((time.time() - start_time) * 1000)
-                        add_log(db, job_id, "INFO", f"Found factor via Trurl equation search: {prime}", "equation_search")
-
-                        # Get complementary factor
-                        cofactor = n // prime
-
-                        # Verify all Trurl constraints
-                        x_factor = min(prime, cofactor)
-                        y_factor = max(prime, cofactor)
-                        constraints = solver.verify_all_constraints(x_factor, y_factor)
-
-                        # Log constraint verification
-                        all_satisfied = all(v for v in constraints.values() if v is not None)
-                        if all_satisfied:
-                            add_log(db, job_id, "INFO",
-                                   "All Trurl constraints verified: pnp=x*y, equation match, x<y, inverse relationship",
-                                   "equation_search",
-                                   payload={"constraints": constraints})
-                        else:
-                            add_log(db, job_id, "WARNING",
-                                   f"Some constraints not satisfied: {constraints}",
-                                   "equation_search",
-                                   payload={"constraints": constraints})
-
-                        # Compute y using Trurl's equation for verification
-                        computed_y = solver.compute_y_from_x(x_factor)
+                # Word-sized n gets a fixed-width fast path: one vectorized
+                # remainder pass over the whole segment in C, no bignum
+                # machinery at all. (A compiled __int128 search kernel was
+                # considered; with no extension build in this tree, the
+                # NumPy pass captures the same win for n < 2^63.)
+                n_word = np.uint64(n) if n_mpz.bit_length() <= 63 else None
+
+                while seg_lo <= bound and factor_prime is None:
+                    seg_hi = min(seg_lo + SEGMENT - 1, bound)
+                    segment_primes = primes_numpy(seg_lo, seg_hi)
+                    seg_lo = seg_hi + 1
+
+                    if n_word is not None:
+                        if len(segment_primes):
+                            hits = np.flatnonzero(n_word % segment_primes == 0)
+                            if hits.size:
+                                factor_prime = int(segment_primes[hits[0]])
+                                break
+                            count += len(segment_primes)
+                            if count >= next_check:
+                                next_check = count + check_interval
+                                if cancellation_requested():
+                                    add_log(db, job_id, "INFO", "Job cancelled by user", "equation_search")
+                                    return {"status": "cancelled"}
+                                last = int(segment_primes[-1])
+                                progress = solver.estimate_progress(last, lower, upper)
+                                job.progress_percent = int(70 + (progress * 0.25))
+                                job.current_candidate = str(last)
+                                _flush_logs(db)
+                                _save_search_checkpoint(job_id, last, count)
+                        continue
+
+                    for i in range(0, len(segment_primes), BLOCK):
+                        batch = segment_primes[i:i + BLOCK]
+
+                        product = _product_tree(batch)
+
+                        if gmpy2.gcd(n_mpz, product) != 1:
+                            factor_prime = _find_divisor_in_block(n_mpz, batch)
+                        if factor_prime is not None:
+                            break
+
+                        count += len(batch)
+                        if count >= next_check:
+                            next_check += check_interval
+                            # Poll for cancellation once per interval — a
+                            # refresh per prime made the loop DB-bound, not
+                            # CPU-bound
+                            if cancellation_requested():
+                                add_log(db, job_id, "INFO", "Job cancelled by user", "equation_search")
+                                return {"status": "cancelled"}
+
+                            # Update progress
+                            last = int(batch[-1])
+                            progress = solver.estimate_progress(last, lower, upper)
+                            job.progress_percent = int(70 + (progress * 0.25))
+                            job.current_candidate = str(last)
+                            _flush_logs(db)
+                            _save_search_checkpoint(job_id, last, count)
+
+                if factor_prime is not None:
+                    prime = factor_prime
+                    elapsed_ms = _elapsed_ms()
+                    add_log(db, job_id, "INFO", f"Found factor via Trurl equation search: {prime}", "equation_search")
+
+                    # Get complementary factor
+                    cofactor = int(n_mpz // prime)
+
+                    # Verify all Trurl constraints
+                    x_factor = min(prime, cofactor)
+                    y_factor = max(prime, cofactor)
+                    constraints = solver.verify_all_constraints(x_factor, y_factor)
+
+                    # Log constraint verification
+                    all_satisfied = all(v for v in constraints.values() if v is not None)
+                    if all_satisfied:
                         add_log(db, job_id, "INFO",
-                               f"Trurl equation y = (((pnp^2/x) + x^2) / pnp) yields {computed_y} (actual y = {y_factor})",
-                               "equation_search")
-
-                        # Record factors
-                        record_factor(db, job_id, prime, "equation_search", elapsed_ms,
-                                    primality_test, generate_certs)
-                        found_factors.append(prime)
-
-                        if cofactor > 1:
-                            if primality_test(cofactor):
-                                add_log(db, job_id, "INFO", f"Cofactor {cofactor} is prime", "equation_search")
-                                record_factor(db, job_id, cofactor, "equation_search", elapsed_ms,
-                                            primality_test, generate_certs)
-                                found_factors.append(cofactor)
-                        break
-
-                    count += 1
-                    if count % check_interval == 0:
-                        # Update progress
-                        progress = solver.estimate_progress(prime, lower, upper)
-                        job.progress_percent = int(70 + (progress * 0.25))
-                        job.current_candidate = str(prime)
-                        db.commit()
-
-                    prime = it.next_prime()
+                               "All Trurl constraints verified: pnp=x*y, equation match, x<y, inverse relationship",
+                               "equation_search",
+                               payload={"constraints": constraints})
+                    else:
+                        add_log(db, job_id, "WARNING",
+                               f"Some constraints not satisfied: {constraints}",
+                               "equation_search",
+                               payload={"constraints": constraints})
 
-        # Finalize
+                    # Compute y using Trurl's equation for verification
+                    computed_y = solver.compute_y_from_x(x_factor)
+                    add_log(db, job_id, "INFO",
+                           f"Trurl equation y = (((pnp^2/x) + x^2) / pnp) yields {computed_y} (actual y = {y_factor})",
+                           "equation_search")
+
+                    # Record factors
+                    found_factors.extend(record_factor_pair(
+                        db, job_id, prime, cofactor, "equation_search", elapsed_ms,
+                        primality_test, generate_certs))
+
+        # Finalize. Stringify the factors once — each str() of an
+        # RSA-scale factor is an O(d^2) conversion, and the job row and
+        # the return payload want the same list
+        factor_strings = list(map(str, found_factors))
+        _clear_search_checkpoint(job_id)
         if found_factors:
             job.status = JobStatus.COMPLETED
-            job.factors_found = [str(f) for f in found_factors]
+            job.factors_found = factor_strings
             add_log(db, job_id, "INFO", f"Factorization complete: found {len(found_factors)} factors", "complete")
+
+            # Populate the content-addressed cache from the recorded results
+            # so resubmissions of this n complete in one Redis round-trip
+            rows = db.execute(
+                select(JobResult.factor, JobResult.is_prime,
+                       JobResult.found_by_algorithm)
+                .where(JobResult.job_id == job_id)
+            ).all()
+            if rows:
+                _set_cached_factors(job.n, [
+                    {"factor": factor, "is_prime": is_prime,
+                     "found_by_algorithm": algorithm}
+                    for factor, is_prime, algorithm in rows
+                ])
         else:
             job.status = JobStatus.COMPLETED
             add_log(db, job_id, "WARNING", "No factors found with current algorithms", "complete")
 
         job.finished_at = datetime.utcnow()
-        job.total_time_seconds = int(time.time() - start_time)
+        job.total_time_seconds = _elapsed_ms() // 1000
         job.progress_percent = 100
-        db.commit()
+        _flush_logs(db)
 
-        return {"status": "completed", "factors": [str(f) for f in found_factors]}
+        return {"status": "completed", "factors": factor_strings}
 
     except Exception as e:
+        # The failed statement may have poisoned the transaction; recover
+        # the session before writing the failure log and status
+        try:
+            db.rollback()
+        except Exception:
+            pass
         add_log(db, job_id, "ERROR", f"Job failed: {str(e)}", "error")
-        job = db.query(Job).filter(Job.id == job_id).first()
+        # Identity-map lookup: resolves without SQL when the row was
+        # already loaded in the try block
+        job = db.get(Job, job_id)
         if job:
             job.status = JobStatus.FAILED
             job.error_message = str(e)
@@ -673,21 +1526,105 @@ def run_factorization_task(job_id: str):
         raise
 
     finally:
+        try:
+            _log_buffer.flush()
+        except Exception:
+            pass
+        _log_buffer = None
+        cancel_event.set()  # stop the control listener thread
+        if control_pubsub is not None:
+            try:
+                control_pubsub.close()
+            except Exception:
+                pass
         db.close()
 
 
 def add_log(db, job_id: str, level: str, message: str, stage: str, payload: dict = None):
-    """Helper to add log entry"""
-    from app.models import JobLog
-    log = JobLog(
-        job_id=job_id,
-        level=level,
-        message=message,
-        stage=stage,
-        payload=payload
-    )
-    db.add(log)
-    db.commit()
+    """Helper to add log entry (buffered inside a task; ERROR flushes immediately)"""
+    timestamp = datetime.utcnow()
+    row = {
+        "job_id": job_id,
+        "timestamp": timestamp,
+        "level": level,
+        "message": message,
+        "stage": stage,
+        "payload": payload,
+    }
+
+    if _log_buffer is not None and _log_buffer.job_id == job_id:
+        _log_buffer.append(row)
+        if level == "ERROR":
+            _log_buffer.flush()
+    else:
+        db.execute(insert(JobLog.__table__), [row])
+        db.commit()
+
+    _publish_job_event(job_id, {
+        "type": "log",
+        "timestamp": timestamp.isoformat(),
+        "level": level,
+        "message": message,
+        "stage": stage,
+        "payload": payload
+    })
+
+
+def record_factor_pair(db, job_id: str, factor: int, cofactor: int, algorithm: str,
+                       elapsed_ms: int, primality_test=None, generate_certs=False):
+    """
+    Record a factor and, when prime, its cofactor with one bulk insert.
+
+    The stage blocks all follow the same shape — record the factor, then
+    test and maybe record the cofactor — which used to mean two separate
+    insert paths. Building both rows first and inserting them together
+    keeps the found-factor bookkeeping to a single statement.
+
+    Returns:
+        List of the factors actually recorded (for found_factors)
+    """
+    from app.algos import is_prime_fast, generate_certificate_simple
+
+    if primality_test is None:
+        primality_test = is_prime_fast
+
+    recorded = [factor]
+    # Test each value exactly once and carry the verdict into the rows; the
+    # cofactor guard already decides its primality, so re-running the test
+    # in the row loop would double the slowest call in this helper
+    verdicts = {factor: primality_test(factor)}
+    if cofactor > 1 and cofactor != factor and primality_test(cofactor):
+        add_log(db, job_id, "INFO", f"Cofactor {cofactor} is prime", algorithm)
+        recorded.append(cofactor)
+        verdicts[cofactor] = True
+
+    rows = []
+    found_at = datetime.utcnow()
+    for f in recorded:
+        is_prime = verdicts[f]
+        certificate = None
+        if generate_certs and is_prime:
+            try:
+                cert = generate_certificate_simple(f)
+                if cert:
+                    certificate = cert.to_dict()
+            except Exception as e:
+                add_log(db, job_id, "WARNING",
+                       f"Failed to generate certificate for factor {f}: {e}",
+                       algorithm)
+        rows.append({
+            "job_id": job_id,
+            "factor": str(f),
+            "is_prime": is_prime,
+            "certificate": certificate,
+            "found_by_algorithm": algorithm,
+            "elapsed_ms": elapsed_ms,
+            "found_at": found_at,
+        })
+
+    # Joins the open transaction; lands with the caller's next flush
+    db.execute(insert(JobResult.__table__), rows)
+    return recorded
 
 
 def record_factor(db, job_id: str, factor: int, algorithm: str, elapsed_ms: int,
@@ -704,7 +1641,6 @@ def record_factor(db, job_id: str, factor: int, algorithm: str, elapsed_ms: int,
         primality_test: Function to test primality (default: is_prime_fast)
         generate_cert: Whether to generate a primality certificate
     """
-    from app.models import JobResult
     from app.algos import is_prime_fast, generate_certificate_simple
 
     if primality_test is None:
@@ -718,19 +1654,22 @@ def record_factor(db, job_id: str, factor: int, algorithm: str, elapsed_ms: int,
         try:
             cert = generate_certificate_simple(factor)
             if cert:
-                certificate = cert.to_json()
+                certificate = cert.to_dict()
         except Exception as e:
             add_log(db, job_id, "WARNING",
                    f"Failed to generate certificate for factor {factor}: {e}",
                    algorithm)
 
-    result = JobResult(
-        job_id=job_id,
-        factor=str(factor),
-        is_prime=is_prime,
-        certificate=certificate,
-        found_by_algorithm=algorithm,
-        elapsed_ms=elapsed_ms
-    )
-    db.add(result)
-    db.commit()
+    # No commit here: the insert joins the open transaction and lands with
+    # the caller's next flush (stage boundary or finalize), so the whole
+    # found-factor path — result rows, logs, job status — settles in one
+    # commit instead of one per write.
+    db.execute(insert(JobResult.__table__), [{
+        "job_id": job_id,
+        "factor": str(factor),
+        "is_prime": is_prime,
+        "certificate": certificate,
+        "found_by_algorithm": algorithm,
+        "elapsed_ms": elapsed_ms,
+        "found_at": datetime.utcnow(),
+    }])
@@ -750,7 +750,7 @@ export default function JobDetail() {
                           {result.certificate ? (
                             <button
                               onClick={() => {
-                                const blob = new Blob([result.certificate], { type: 'application/json' })
+                                const blob = new Blob([JSON.stringify(result.certificate, null, 2)], { type: 'application/json' })
                                 const url = URL.createObjectURL(blob)
                                 const a = document.createElement('a')
                                 a.href = url
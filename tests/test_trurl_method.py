@@ -5,6 +5,8 @@ Test script for Trurl's semiprime factorization method.
 This demonstrates the equation-based approach on small semiprimes
 that can be verified quickly.
 """
+import numpy as np
+
 from app.equations.semiprime_equation import SemiPrimeEquationSolver
 
 
@@ -98,8 +100,10 @@ def test_constraint_equation():
     print(f"\nConstraint: ((pnp^2/x + x^2) / x) / pnp")
     print(f"Testing values around true factor x=11:")
 
-    for x in range(7, 16):
-        constraint_val = solver.compute_constraint_value(x)
+    # One vectorized pass over the sweep instead of a solver call per x
+    xs = np.arange(7, 16)
+    constraint_vals = solver.compute_constraint_values_batch(xs)
+    for x, constraint_val in zip(xs.tolist(), constraint_vals):
         y_computed = solver.compute_y_from_x(x)
         is_factor = solver.verify_factor(x)
         marker = " ← TRUE FACTOR" if is_factor else ""
@@ -6,17 +6,29 @@ Tests the equation: y = ((((pnp^2 / x) + x^2) / x) / pnp)
 Finding x where y = 1
 """
 
+import math
 import sys
 sys.path.insert(0, '/opt/docker/SemiPrimeDivide/api')
 
 from app.equations.semiprime_equation import SemiPrimeEquationSolver
 
+_LOG10_2 = 0.30102999566398114
+
+
+def digit_count(n) -> int:
+    """Decimal digits of n from bit_length — O(1) where len(str(n)) is O(d^2)"""
+    if n <= 0:
+        return 1
+    d = int(n.bit_length() * _LOG10_2)
+    # the float estimate sits one low just below powers of ten
+    return d + 1 if n >= 10 ** d else d
+
 def test_semiprime(pnp, expected_p=None, expected_q=None, name=""):
     """Test a semiprime with Trurl's method"""
     print(f"\n{'='*80}")
     print(f"Testing: {name}")
     print(f"pnp = {pnp}")
-    print(f"pnp digits = {len(str(pnp))}")
+    print(f"pnp digits = {digit_count(pnp)}")
 
     solver = SemiPrimeEquationSolver(pnp)
 
@@ -24,7 +36,7 @@ def test_semiprime(pnp, expected_p=None, expected_q=None, name=""):
     x_at_y_one = solver.find_x_when_y_equals_one()
     print(f"\nTrurl's method - x where y=1:")
     print(f"  x = {x_at_y_one}")
-    print(f"  x digits = {len(str(x_at_y_one))}")
+    print(f"  x digits = {digit_count(x_at_y_one)}")
 
     # Verify by computing y at this x
     y_computed = solver.compute_constraint_value(x_at_y_one)
@@ -39,11 +51,10 @@ def test_semiprime(pnp, expected_p=None, expected_q=None, name=""):
         print(f"\nActual factors:")
         print(f"  p = {smaller}")
         print(f"  q = {larger}")
-        print(f"  p digits = {len(str(smaller))}")
-        print(f"  q digits = {len(str(larger))}")
+        print(f"  p digits = {digit_count(smaller)}")
+        print(f"  q digits = {digit_count(larger)}")
 
         # How close is x_at_y_one to the actual smaller factor?
-        import math
         ratio = x_at_y_one / smaller
         log_ratio = math.log10(ratio) if ratio > 0 else 0
 
@@ -60,8 +71,8 @@ def test_semiprime(pnp, expected_p=None, expected_q=None, name=""):
     # Get bounds using current find_initial_bounds
     lower, upper = solver.find_initial_bounds()
     print(f"\nCurrent find_initial_bounds():")
-    print(f"  lower = 10^{len(str(lower))-1} (approx)")
-    print(f"  upper = 10^{len(str(upper))-1} (approx)")
+    print(f"  lower = 10^{digit_count(lower)-1} (approx)")
+    print(f"  upper = 10^{digit_count(upper)-1} (approx)")
 
     if expected_p and expected_q:
         smaller = min(expected_p, expected_q)